@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Compare benchmark results against the committed baseline.
+
+Reads one or more result files from benchmarks.micro, benchmarks.load or
+benchmarks.startup (repeated runs are pooled), and compares the median of
+every tracked metric with the baseline. A metric only counts as a
+regression when its median is worse by more than the threshold and its
+confidence interval does not overlap the baseline's, so ordinary
+run-to-run noise passes.
+Build baselines from several runs so they capture run-to-run variance.
+Prints a diff table and exits with status 1 on any regression.
+
+Run from the backend directory:
+    for i in 1 2 3; do python -m benchmarks.micro --output /tmp/micro-$i.json; done
+    python -m benchmarks.compare /tmp/micro-*.json
+    python -m benchmarks.compare /tmp/micro-*.json --update-baseline
+"""
+
+import argparse
+import fnmatch
+import json
+import statistics
+import sys
+from datetime import datetime
+from math import comb
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import BENCHMARKS_DIR, machine_metadata
+
+BASELINE_PATH = BENCHMARKS_DIR / "baseline.json"
+DEFAULT_THRESHOLD = 10.0  # percent
+DEFAULT_CONFIDENCE = 0.95
+
+# Tracked load benchmark metrics: key in the endpoint summary -> (unit, better direction)
+LOAD_METRICS = {"p50_ms": ("ms", "lower"), "p95_ms": ("ms", "lower"), "throughput_rps": ("rps", "higher")}
+
+
+def extract_metrics(report: dict) -> Dict[str, dict]:
+    """Tracked metrics of one result file as name -> {unit, direction, samples}"""
+    metrics = {}
+    if report.get("benchmark") == "micro":
+        for name, result in report["results"].items():
+            metrics[name] = {"unit": "us", "direction": "lower", "samples": list(result["samples_us"])}
+    elif report.get("benchmark") == "load":
+        for transport, result in report["results"].items():
+            for endpoint, summary in result["endpoints"].items():
+                for key, (unit, direction) in LOAD_METRICS.items():
+                    metrics[f"load.{transport}.{endpoint}.{key}"] = {
+                        "unit": unit, "direction": direction, "samples": [summary[key]]
+                    }
+    elif report.get("benchmark") == "startup":
+        for name, result in report["results"].items():
+            metrics[f"startup.{name}"] = {"unit": "ms", "direction": "lower", "samples": list(result["samples_ms"])}
+    else:
+        raise ValueError(f"unknown benchmark result type: {report.get('benchmark')!r}")
+    return metrics
+
+
+def pool_metrics(reports: List[dict]) -> Dict[str, dict]:
+    """Merge repeated runs: samples of the same metric are concatenated"""
+    pooled: Dict[str, dict] = {}
+    for report in reports:
+        for name, metric in extract_metrics(report).items():
+            if name in pooled:
+                pooled[name]["samples"].extend(metric["samples"])
+            else:
+                pooled[name] = metric
+    return pooled
+
+
+def median_confidence_interval(samples: List[float], confidence: float = DEFAULT_CONFIDENCE) -> Tuple[float, float]:
+    """
+    Distribution-free confidence interval for the median, from order statistics.
+
+    Uses the largest k such that [x_k, x_(n-k+1)] covers the median with at
+    least the requested confidence; with too few samples for that, the full
+    sample range is returned.
+    """
+    values = sorted(samples)
+    n = len(values)
+    alpha = 1 - confidence
+    k = 0
+    tail = 0.0
+    # P(Binomial(n, 1/2) <= j), grown until adding one more rank would exceed alpha / 2
+    for j in range(n // 2):
+        tail += comb(n, j) / 2 ** n
+        if tail > alpha / 2:
+            break
+        k = j + 1
+    if k == 0:
+        return values[0], values[-1]
+    return values[k - 1], values[n - k]
+
+
+def compare_metric(baseline: dict, current: dict, threshold: float, confidence: float) -> dict:
+    base_median = statistics.median(baseline["samples"])
+    current_median = statistics.median(current["samples"])
+    base_low, base_high = median_confidence_interval(baseline["samples"], confidence)
+    current_low, current_high = median_confidence_interval(current["samples"], confidence)
+
+    change = (current_median - base_median) / base_median * 100 if base_median else 0.0
+    # Positive when the metric got worse, whichever direction is better
+    worse_by = change if baseline["direction"] == "lower" else -change
+    if baseline["direction"] == "lower":
+        separated_worse, separated_better = current_low > base_high, current_high < base_low
+    else:
+        separated_worse, separated_better = current_high < base_low, current_low > base_high
+
+    if worse_by > threshold and separated_worse:
+        status = "REGRESSION"
+    elif worse_by < -threshold and separated_better:
+        status = "improved"
+    elif abs(worse_by) > threshold:
+        status = "noise"
+    else:
+        status = "ok"
+
+    return {
+        "baseline": base_median, "current": current_median, "change": change,
+        "current_ci": (current_low, current_high), "threshold": threshold, "status": status,
+        "unit": baseline["unit"],
+    }
+
+
+def threshold_for(name: str, default: float, overrides: Dict[str, float]) -> float:
+    """Per-metric threshold from the baseline's glob overrides, e.g. {"password.*": 25}"""
+    for pattern, value in overrides.items():
+        if fnmatch.fnmatch(name, pattern):
+            return value
+    return default
+
+
+def format_table(rows: List[Tuple[str, dict]]) -> str:
+    header = ("metric", "baseline", "current", "change", "current CI", "limit", "status")
+    lines = [header]
+    for name, result in rows:
+        unit = result["unit"]
+        low, high = result["current_ci"]
+        lines.append((
+            name,
+            f"{result['baseline']:.3f} {unit}",
+            f"{result['current']:.3f} {unit}",
+            f"{result['change']:+.1f}%",
+            f"[{low:.3f}, {high:.3f}]",
+            f"{result['threshold']:.0f}%",
+            result["status"],
+        ))
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    formatted = ["  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in lines]
+    formatted.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(formatted)
+
+
+def load_json(path: Path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_baseline(path: Path, metrics: Dict[str, dict], previous: Optional[dict]):
+    baseline = {
+        "created_at": datetime.utcnow().isoformat(),
+        "machine": machine_metadata(),
+        # Keep hand-tuned settings when refreshing the numbers
+        "threshold": (previous or {}).get("threshold", DEFAULT_THRESHOLD),
+        "thresholds": (previous or {}).get("thresholds", {}),
+        "metrics": metrics,
+    }
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("results", nargs="+", type=Path, help="result files from benchmarks.micro/load/startup")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline file")
+    parser.add_argument("--threshold", type=float,
+                        help="allowed slowdown in percent (default: the baseline's, else 10)")
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE,
+                        help="confidence level of the median intervals")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="replace the baseline metrics with these results instead of comparing")
+    args = parser.parse_args()
+
+    current = pool_metrics([load_json(path) for path in args.results])
+    baseline = load_json(args.baseline) if args.baseline.exists() else None
+
+    if args.update_baseline:
+        if baseline is not None:
+            # Metrics from other benchmark types stay in the baseline
+            current = {**baseline["metrics"], **current}
+        write_baseline(args.baseline, current, baseline)
+        print(f"baseline written to {args.baseline} ({len(current)} metrics)")
+        return
+
+    if baseline is None:
+        raise SystemExit(f"no baseline at {args.baseline}; create one with --update-baseline")
+
+    machine = machine_metadata()
+    for key in ("python", "machine", "cpu_count"):
+        if baseline["machine"].get(key) != machine.get(key):
+            print(f"warning: baseline was recorded with {key}={baseline['machine'].get(key)!r}, "
+                  f"this machine has {machine.get(key)!r}", file=sys.stderr)
+
+    default_threshold = args.threshold if args.threshold is not None else baseline.get("threshold", DEFAULT_THRESHOLD)
+    overrides = {} if args.threshold is not None else baseline.get("thresholds", {})
+
+    rows = []
+    for name, metric in sorted(current.items()):
+        if name not in baseline["metrics"]:
+            print(f"note: {name} has no baseline yet", file=sys.stderr)
+            continue
+        threshold = threshold_for(name, default_threshold, overrides)
+        rows.append((name, compare_metric(baseline["metrics"][name], metric, threshold, args.confidence)))
+
+    print(format_table(rows))
+    regressions = [name for name, result in rows if result["status"] == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nno regressions in {len(rows)} metrics")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+End-to-end API load benchmark.
+
+Seeds a database with N users x M tasks, then drives a mix of register,
+login, list, create, toggle and delete requests against the app - in
+process through the httpx ASGI transport, and over a real socket against
+a uvicorn subprocess - and reports throughput and p50/p95/p99 latency per
+endpoint as JSON.
+
+Run from the backend directory:
+    python -m benchmarks.load --users 20 --tasks 50 --requests 2000
+
+Seeding drops every table first, so --database-url also needs --reset.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BACKEND_DIR))
+
+from benchmarks.common import machine_metadata, percentile
+
+PASSWORD = "benchmark-password"
+
+# Relative weight of each operation in the request mix
+DEFAULT_MIX = {
+    "list": 40,
+    "create": 20,
+    "toggle": 15,
+    "delete": 10,
+    "login": 10,
+    "register": 5,
+}
+
+
+@dataclass
+class SeededUser:
+    id: str
+    email: str
+    token: str
+    task_ids: List[str] = field(default_factory=list)
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+async def seed(users: int, tasks_per_user: int, rng: random.Random) -> List[SeededUser]:
+    """Recreate the schema, dropping existing tables, and insert users and tasks with bulk Core inserts"""
+    from sqlalchemy import insert
+    from sqlmodel import SQLModel
+
+    from src.auth.jwt_handler import create_access_token
+    from src.database.engine import engine
+    from src.models.task import Task
+    from src.models.user import User
+    from src.auth.password_hasher import get_pwd_context
+
+    # Every seeded user shares one password; hashing it once keeps seeding fast
+    hashed_password = get_pwd_context().hash(PASSWORD)
+    now = datetime.utcnow()
+
+    seeded, user_rows, task_rows = [], [], []
+    for i in range(users):
+        user_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        email = f"bench-{i}@example.com"
+        user_rows.append({"id": user_id, "email": email, "hashed_password": hashed_password,
+                          "created_at": now, "updated_at": now})
+        user = SeededUser(
+            id=str(user_id), email=email,
+            token=create_access_token({"user_id": str(user_id), "email": email}, timedelta(hours=12))
+        )
+        for j in range(tasks_per_user):
+            task_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            created_at = now - timedelta(seconds=j)
+            task_rows.append({"id": task_id, "user_id": user_id, "title": f"Task {j}",
+                              "description": "Seeded benchmark task" if j % 2 else None,
+                              "completed": rng.random() < 0.3, "created_at": created_at,
+                              "updated_at": created_at})
+            user.task_ids.append(str(task_id))
+        seeded.append(user)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+        if user_rows:
+            await conn.execute(insert(User), user_rows)
+        for start in range(0, len(task_rows), 5000):
+            await conn.execute(insert(Task), task_rows[start:start + 5000])
+    await engine.dispose()
+    return seeded
+
+
+class Workload:
+    """Picks the next operation and builds its request from the seeded state"""
+
+    def __init__(self, users: List[SeededUser], mix: Dict[str, int], rng: random.Random):
+        self.users = users
+        self.operations = list(mix)
+        self.weights = list(mix.values())
+        self.rng = rng
+
+    def next_request(self):
+        """Returns (operation, method, path, kwargs, on_success callback)"""
+        operation = self.rng.choices(self.operations, self.weights)[0]
+        user = self.rng.choice(self.users)
+
+        if operation in ("toggle", "delete") and not user.task_ids:
+            operation = "create"
+
+        if operation == "list":
+            return operation, "GET", f"/api/{user.id}/tasks", {"headers": user.headers}, None
+        if operation == "create":
+            def remember(response):
+                user.task_ids.append(response.json()["id"])
+            body = {"title": "Benchmark task", "description": "Created under load", "user_id": user.id}
+            return operation, "POST", f"/api/{user.id}/tasks", {"headers": user.headers, "json": body}, remember
+        if operation == "toggle":
+            task_id = self.rng.choice(user.task_ids)
+            return operation, "PATCH", f"/api/{user.id}/tasks/{task_id}/complete", {"headers": user.headers}, None
+        if operation == "delete":
+            task_id = user.task_ids.pop(self.rng.randrange(len(user.task_ids)))
+            return operation, "DELETE", f"/api/{user.id}/tasks/{task_id}", {"headers": user.headers}, None
+        if operation == "login":
+            body = {"email": user.email, "password": PASSWORD}
+            return operation, "POST", "/api/v1/login", {"json": body}, None
+
+        body = {"email": f"bench-new-{uuid.uuid4().hex[:12]}@example.com", "password": PASSWORD}
+        return operation, "POST", "/api/v1/register", {"json": body}, None
+
+
+def summarize(samples: Dict[str, List[float]], errors: Dict[str, int], duration: float) -> dict:
+    total = sum(len(latencies) for latencies in samples.values())
+    endpoints = {}
+    for operation, latencies in sorted(samples.items()):
+        latencies = sorted(latencies)
+        endpoints[operation] = {
+            "count": len(latencies),
+            "errors": errors.get(operation, 0),
+            "throughput_rps": round(len(latencies) / duration, 2),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "max_ms": round(latencies[-1] * 1000, 3),
+        }
+    return {
+        "requests": total,
+        "errors": sum(errors.values()),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(total / duration, 2) if duration else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+async def drive(client, workload: Workload, requests: int, concurrency: int, warmup: int) -> dict:
+    """Run the request mix with `concurrency` workers until `requests` have completed"""
+    samples: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+
+    async def phase(count: int, record: bool):
+        remaining = count
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                operation, method, path, kwargs, on_success = workload.next_request()
+                start = time.perf_counter()
+                response = await client.request(method, path, **kwargs)
+                elapsed = time.perf_counter() - start
+                if response.status_code < 400:
+                    if on_success is not None:
+                        on_success(response)
+                elif record:
+                    errors[operation] = errors.get(operation, 0) + 1
+                if record:
+                    samples.setdefault(operation, []).append(elapsed)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    # Warm-up requests fill pools and caches and are not recorded
+    await phase(warmup, record=False)
+    start = time.perf_counter()
+    await phase(requests, record=True)
+    return summarize(samples, errors, time.perf_counter() - start)
+
+
+async def run_asgi(workload: Workload, args) -> dict:
+    import httpx
+    from src.app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        return await drive(client, workload, args.requests, args.concurrency, args.warmup)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_live(base_url: str, process: subprocess.Popen, timeout: float = 30.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                if (await client.get("/livez")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("uvicorn did not become live in time")
+
+
+async def run_uvicorn(workload: Workload, args) -> dict:
+    import httpx
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=os.environ.copy()
+    )
+    try:
+        await wait_until_live(base_url, process)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+            return await drive(client, workload, args.requests, args.concurrency, args.warmup)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def run(args) -> dict:
+    report = {
+        "benchmark": "load",
+        "timestamp": datetime.utcnow().isoformat(),
+        "config": {
+            "users": args.users, "tasks_per_user": args.tasks, "requests": args.requests,
+            "warmup": args.warmup, "concurrency": args.concurrency, "seed": args.seed,
+            "database": os.environ["DATABASE_URL"].split("@")[-1], "mix": DEFAULT_MIX,
+        },
+        "machine": machine_metadata(),
+        "results": {},
+    }
+
+    transports = ["asgi", "uvicorn"] if args.transport == "both" else [args.transport]
+    for transport in transports:
+        # Reseed before each transport so both runs start from the same data
+        users = await seed(args.users, args.tasks, random.Random(args.seed))
+        workload = Workload(users, DEFAULT_MIX, random.Random(args.seed + 1))
+        runner = run_asgi if transport == "asgi" else run_uvicorn
+        report["results"][transport] = await runner(workload, args)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="seeded users")
+    parser.add_argument("--tasks", type=int, default=50, help="seeded tasks per user")
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests per transport")
+    parser.add_argument("--warmup", type=int, default=100, help="unmeasured requests before measuring")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent client workers")
+    parser.add_argument("--transport", choices=("asgi", "uvicorn", "both"), default="both")
+    parser.add_argument("--database-url",
+                        help="database to seed and run against; every table is dropped (default: a temporary SQLite file)")
+    parser.add_argument("--reset", action="store_true", help="confirm dropping every table in --database-url")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed for data and request mix")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    if args.database_url and not args.reset:
+        parser.error("seeding drops every table in --database-url; pass --reset to confirm")
+
+    # The engine reads these at import time, so set them before importing the app
+    tmpdir: Optional[tempfile.TemporaryDirectory] = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        tmpdir = tempfile.TemporaryDirectory(prefix="todo-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmpdir.name}/bench.db"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Every simulated user comes from one address; measure capacity, not the rate limiter
+    os.environ.setdefault("RATE_LIMIT", "false")
+
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the request hot paths.
+
+Covers token creation and verification, password hashing, TaskRead
+construction and JSON encoding for 1/100/1000 tasks (against the fast
+serialization path), AuthMiddleware dispatch and the ErrorHandlerMiddleware
+exception paths. Each benchmark is calibrated to run for at least
+--min-time per repeat; per-call times of every repeat are saved together
+with machine metadata.
+
+Run from the backend directory:
+    python -m benchmarks.micro                      # everything
+    python -m benchmarks.micro --filter serialize   # names containing "serialize"
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import RESULTS_DIR, machine_metadata
+
+# Benchmarks register themselves here: name -> (factory, is_async).
+# A factory does the setup and returns the zero-argument callable to time.
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, is_async: bool = False):
+    def register(factory):
+        BENCHMARKS[name] = (factory, is_async)
+        return factory
+    return register
+
+
+# Auth ----------------------------------------------------------------------
+
+@benchmark("jwt.create_access_token")
+def bench_create_access_token():
+    from src.auth.jwt_handler import create_access_token
+
+    data = {"user_id": str(uuid.uuid4()), "email": "bench@example.com"}
+    return lambda: create_access_token(data, timedelta(minutes=30))
+
+
+@benchmark("jwt.verify_token")
+def bench_verify_token():
+    from src.auth.jwt_handler import create_access_token, verify_token
+
+    token = create_access_token({"user_id": str(uuid.uuid4()), "email": "bench@example.com"})
+    return lambda: verify_token(token)
+
+
+@benchmark("password.hash")
+def bench_password_hash():
+    from src.auth.password_hasher import get_pwd_context
+
+    pwd_context = get_pwd_context()
+    return lambda: pwd_context.hash("benchmark-password")
+
+
+@benchmark("password.verify")
+def bench_password_verify():
+    from src.auth.password_hasher import get_pwd_context
+
+    pwd_context = get_pwd_context()
+    hashed = pwd_context.hash("benchmark-password")
+    return lambda: pwd_context.verify("benchmark-password", hashed)
+
+
+# Serialization -------------------------------------------------------------
+
+def make_tasks(count: int) -> list:
+    from src.models.user import User  # noqa: F401 - registers the Task.user relationship
+    from src.models.task import Task
+
+    user_id = uuid.uuid4()
+    base = datetime(2026, 1, 1)
+    return [
+        Task(title=f"Task {i}", description="Need to buy milk" if i % 3 else None,
+             completed=bool(i % 2), user_id=user_id,
+             created_at=base + timedelta(seconds=i), updated_at=base + timedelta(seconds=i))
+        for i in range(count)
+    ]
+
+
+def register_serialization(count: int):
+    @benchmark(f"serialize.task_read.{count}")
+    def bench_task_read():
+        from src.schemas.task import TaskListResponse, TaskRead
+
+        tasks = make_tasks(count)
+
+        def run():
+            items = [TaskRead.model_validate(task) for task in tasks]
+            return TaskListResponse(tasks=items, total_count=count).model_dump_json()
+        return run
+
+    @benchmark(f"serialize.fast_path.{count}")
+    def bench_fast_path():
+        from src.utils.serialization import task_list_response
+
+        tasks = make_tasks(count)
+        return lambda: task_list_response(tasks, count).body
+
+
+for _count in (1, 100, 1000):
+    register_serialization(_count)
+
+
+# Middleware ----------------------------------------------------------------
+
+def http_scope(path: str, headers: Optional[dict] = None) -> dict:
+    return {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "scheme": "http", "server": ("bench", 80),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    }
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+@benchmark("middleware.auth.protected", is_async=True)
+def bench_auth_protected():
+    from src.auth.jwt_handler import create_access_token
+    from src.auth.middleware import AuthMiddleware
+
+    middleware = AuthMiddleware(ok_app)
+    user_id = str(uuid.uuid4())
+    token = create_access_token({"user_id": user_id, "email": "bench@example.com"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # A fresh scope per call - the middleware writes request state into it
+    return lambda: middleware(http_scope(f"/api/{user_id}/tasks", headers), receive, send)
+
+
+@benchmark("middleware.auth.excluded", is_async=True)
+def bench_auth_excluded():
+    from src.auth.middleware import AuthMiddleware
+
+    middleware = AuthMiddleware(ok_app)
+    return lambda: middleware(http_scope("/health"), receive, send)
+
+
+def register_rate_limit(name: str, limit: str):
+    @benchmark(f"middleware.rate_limit.{name}", is_async=True)
+    def bench_rate_limit():
+        from fastapi import HTTPException
+        from src.middleware.rate_limit import (
+            MemoryRateLimitStore, RateLimit, RateLimitMiddleware, UserRateLimitMiddleware
+        )
+
+        # Both halves, with AuthMiddleware's effect in between: the user is known
+        store = MemoryRateLimitStore()
+        user_id = str(uuid.uuid4())
+        user_middleware = UserRateLimitMiddleware(ok_app, user_limit=RateLimit.parse(limit), store=store)
+
+        async def authenticated(scope, receive, send):
+            scope["state"]["user_id"] = user_id
+            await user_middleware(scope, receive, send)
+
+        middleware = RateLimitMiddleware(authenticated, ip_limit=RateLimit.parse("1000000000/second"), store=store)
+
+        async def call():
+            scope = http_scope(f"/api/{user_id}/tasks")
+            try:
+                await middleware(scope, receive, send)
+            except HTTPException:
+                pass
+
+        return call
+
+
+# Allowed: buckets that never run out. Rejected: the 429 path, once the budget is spent
+register_rate_limit("allowed", "1000000000/second")
+register_rate_limit("rejected", "1/day")
+
+
+def register_error_path(name: str, make_exception: Callable[[], Exception]):
+    @benchmark(f"middleware.error_handler.{name}", is_async=True)
+    def bench_error_path():
+        from src.middleware.error_handler import ErrorHandlerMiddleware
+
+        async def failing_app(scope, receive, send):
+            raise make_exception()
+
+        middleware = ErrorHandlerMiddleware(ok_app if name == "passthrough" else failing_app)
+        return lambda: middleware(http_scope("/api/x/tasks"), receive, send)
+
+
+def _http_exception():
+    from fastapi import HTTPException
+    return HTTPException(status_code=404, detail="Task not found")
+
+
+def _auth_exception():
+    from src.auth.exceptions import InvalidCredentialsException
+    return InvalidCredentialsException()
+
+
+register_error_path("passthrough", lambda: RuntimeError("unused"))
+register_error_path("http_exception", _http_exception)
+register_error_path("auth_exception", _auth_exception)
+register_error_path("unhandled", lambda: RuntimeError("boom"))
+
+
+# Runner --------------------------------------------------------------------
+
+async def _call_async(func, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        await func()
+    return time.perf_counter() - start
+
+
+def _call_sync(func, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def measure(func, is_async: bool, repeat: int, min_time: float, loop) -> dict:
+    """Per-call seconds for each repeat, with the call count calibrated to min_time"""
+    def timed(number: int) -> float:
+        if is_async:
+            return loop.run_until_complete(_call_async(func, number))
+        return _call_sync(func, number)
+
+    number = 1
+    while True:
+        elapsed = timed(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+
+    samples = [timed(number) / number for _ in range(repeat)]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_us": round(min(samples) * 1e6, 3),
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "mean_us": round(statistics.fmean(samples) * 1e6, 3),
+        "stdev_us": round(statistics.stdev(samples) * 1e6, 3) if repeat > 1 else 0.0,
+        "samples_us": [round(sample * 1e6, 3) for sample in samples],
+    }
+
+
+def run(names: List[str], repeat: int, min_time: float) -> dict:
+    from src.utils.logging import setup_logging
+
+    # Log calls still run but nothing is written, so output cost does not skew the numbers
+    setup_logging("CRITICAL")
+
+    loop = asyncio.new_event_loop()
+    results = {}
+    try:
+        for name in names:
+            factory, is_async = BENCHMARKS[name]
+            results[name] = measure(factory(), is_async, repeat, min_time, loop)
+            print(f"{name:45s} {results[name]['median_us']:12.3f} us/call "
+                  f"(min {results[name]['min_us']:.3f}, n={results[name]['number']})", file=sys.stderr)
+    finally:
+        loop.close()
+
+    return {
+        "benchmark": "micro",
+        "timestamp": datetime.utcnow().isoformat(),
+        "config": {"repeat": repeat, "min_time": min_time},
+        "machine": machine_metadata(),
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", action="append", default=[],
+                        help="only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--repeat", type=int, default=7, help="timed repeats per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimum seconds per repeat")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/micro-<timestamp>.json)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return
+
+    names = [name for name in BENCHMARKS if not args.filter or any(f in name for f in args.filter)]
+    if not names:
+        raise SystemExit("no benchmarks match the filter")
+
+    report = run(names, args.repeat, args.min_time)
+
+    if args.output:
+        output = Path(args.output)
+    else:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"micro-{datetime.utcnow():%Y%m%d-%H%M%S}.json"
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark task list serialization.
+
+Compares the response_model path (TaskRead per row, TaskListResponse,
+FastAPI re-validation and jsonable_encoder, stdlib JSON) against the fast
+path in src.utils.serialization that writes ORM rows straight to bytes.
+
+Run from the backend directory:
+    python -m benchmarks.serialization --tasks 1000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from starlette.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from src.models.user import User  # noqa: F401 - registers the Task.user relationship
+from src.models.task import Task
+from src.schemas.task import TaskRead, TaskListResponse
+from src.api.tasks import router
+from src.utils.serialization import task_list_response
+
+
+def make_tasks(count: int) -> list:
+    """Build transient Task rows shaped like real ones"""
+    user_id = uuid.uuid4()
+    base = datetime(2026, 1, 1)
+    return [
+        Task(
+            title=f"Task {i}",
+            description="Need to buy milk, bread, and eggs" if i % 3 else None,
+            completed=bool(i % 2),
+            user_id=user_id,
+            created_at=base + timedelta(seconds=i),
+            updated_at=base + timedelta(seconds=i, microseconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def get_list_response_field():
+    for route in router.routes:
+        if route.path == "/{user_id}/tasks" and "GET" in route.methods:
+            return route.response_field
+    raise RuntimeError("list route not found")
+
+
+async def response_model_path(tasks: list, field) -> bytes:
+    """What the list endpoint did before: build models, re-validate, encode"""
+    task_list = [TaskRead.from_orm(task) for task in tasks]
+    content = TaskListResponse(tasks=task_list, total_count=len(tasks))
+    value = await serialize_response(field=field, response_content=content, is_coroutine=True)
+    return JSONResponse(value).body
+
+
+async def fast_path(tasks: list) -> bytes:
+    return task_list_response(tasks, len(tasks)).body
+
+
+async def timed(func, *args, rounds: int) -> float:
+    """Best per-call time in milliseconds over the given rounds"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def run(task_count: int, rounds: int):
+    tasks = make_tasks(task_count)
+    field = get_list_response_field()
+
+    slow_body = await response_model_path(tasks, field)
+    fast_body = await fast_path(tasks)
+    if slow_body != fast_body:
+        raise SystemExit("fast path output differs from the response_model output")
+
+    slow_ms = await timed(response_model_path, tasks, field, rounds=rounds)
+    fast_ms = await timed(fast_path, tasks, rounds=rounds)
+
+    print(f"tasks={task_count} body={len(fast_body)} bytes rounds={rounds}")
+    print(f"response_model path: {slow_ms:8.3f} ms")
+    print(f"fast path:           {fast_ms:8.3f} ms")
+    print(f"speedup:             {slow_ms / fast_ms:8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000, help="number of tasks in the list")
+    parser.add_argument("--rounds", type=int, default=50, help="timed rounds per path")
+    args = parser.parse_args()
+    asyncio.run(run(args.tasks, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
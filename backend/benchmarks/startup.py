@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: import time and time-to-first-request.
+
+Import time is measured with `python -X importtime` in a fresh interpreter
+for the app module and for init_db.py, and the slowest top-level packages
+are listed. Time-to-first-request is measured from spawning a uvicorn
+worker to its first successful /livez response, so it includes interpreter
+start, imports and the lifespan warm-up (see src/app/lifespan.py).
+
+Worker boot time sets how fast autoscaling adds capacity, so the script
+exits with status 1 when startup regressed against the startup.* metrics
+in benchmarks/baseline.json: the median must be worse by more than the
+baseline's threshold (25% for startup) with confidence intervals that don't
+overlap, as in benchmarks.compare. Absolute times vary too much between
+machines and with background load for fixed budgets. Heavy modules only
+some deployments need - passlib, cProfile/pstats and the admin profile
+endpoints - are imported on first use to keep startup short.
+
+Run from the backend directory:
+    python -m benchmarks.startup --runs 5
+    # Refresh the baseline from several runs after an intended change
+    for i in 1 2 3; do python -m benchmarks.startup --output /tmp/startup-$i.json; done
+    python -m benchmarks.compare /tmp/startup-*.json --update-baseline
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+REPO_DIR = BACKEND_DIR.parent
+sys.path.append(str(BACKEND_DIR))
+
+from benchmarks.common import RESULTS_DIR, machine_metadata
+from benchmarks.compare import (
+    BASELINE_PATH, DEFAULT_CONFIDENCE, DEFAULT_THRESHOLD, compare_metric, extract_metrics, load_json, threshold_for
+)
+from benchmarks.load import free_port
+
+# What to import and where to import it from
+IMPORT_TARGETS = {
+    "app": ("src.app.main", BACKEND_DIR),
+    "init_db": ("init_db", REPO_DIR),
+}
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self us, cumulative us, nesting depth) for each -X importtime line"""
+    modules = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return modules
+
+
+def measure_import(module: str, cwd: Path, env: dict) -> Tuple[float, Dict[str, float]]:
+    """Import time of `module` in a fresh interpreter, and self time per top-level package"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+    lines = parse_importtime(result.stderr)
+    total_us = next(cumulative for name, _, cumulative, depth in lines if name == module and depth == 0)
+    packages: Dict[str, float] = defaultdict(float)
+    for name, self_us, _, _ in lines:
+        packages[name.split(".")[0]] += self_us / 1000
+    return total_us / 1000, packages
+
+
+def measure_first_request(env: dict, timeout: float = 30.0) -> float:
+    """Milliseconds from spawning uvicorn to the first 200 from /livez"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/livez"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            time.sleep(0.005)
+        raise RuntimeError("uvicorn did not answer /livez in time")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def run(runs: int, top: int, env: dict) -> dict:
+    samples: Dict[str, List[float]] = defaultdict(list)
+    packages: Dict[str, Dict[str, List[float]]] = {}
+
+    for name, (module, cwd) in IMPORT_TARGETS.items():
+        per_package: Dict[str, List[float]] = defaultdict(list)
+        for _ in range(runs):
+            total_ms, package_ms = measure_import(module, cwd, env)
+            samples[f"import.{name}"].append(round(total_ms, 3))
+            for package, ms in package_ms.items():
+                per_package[package].append(ms)
+        packages[name] = per_package
+
+    for _ in range(runs):
+        samples["first_request"].append(round(measure_first_request(env), 3))
+
+    results = {}
+    for metric, values in samples.items():
+        results[metric] = {
+            "samples_ms": values,
+            "min_ms": min(values),
+            "median_ms": round(statistics.median(values), 3),
+        }
+
+    return {
+        "benchmark": "startup",
+        "timestamp": datetime.utcnow().isoformat(),
+        "config": {"runs": runs},
+        "machine": machine_metadata(),
+        "results": results,
+        # Median self time per top-level package - where the import time goes
+        "packages": {
+            name: dict(sorted(
+                ((package, round(statistics.median(values), 3)) for package, values in per_package.items()),
+                key=lambda item: item[1], reverse=True
+            )[:top])
+            for name, per_package in packages.items()
+        },
+    }
+
+
+def compare_to_baseline(report: dict, baseline_path: Path) -> Dict[str, dict]:
+    """benchmarks.compare results per startup metric that has a baseline"""
+    if not baseline_path.exists():
+        return {}
+    baseline = load_json(baseline_path)
+    default_threshold = baseline.get("threshold", DEFAULT_THRESHOLD)
+    overrides = baseline.get("thresholds", {})
+
+    compared = {}
+    for name, metric in extract_metrics(report).items():
+        if name in baseline["metrics"]:
+            threshold = threshold_for(name, default_threshold, overrides)
+            compared[name] = compare_metric(baseline["metrics"][name], metric, threshold, DEFAULT_CONFIDENCE)
+    return compared
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per measurement")
+    parser.add_argument("--top", type=int, default=10, help="slowest packages listed per import target")
+    parser.add_argument("--output", type=Path, help="JSON report path (default: benchmarks/results/startup-<time>.json)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline to check against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="todo-startup-") as tmpdir:
+        env = os.environ.copy()
+        env.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tmpdir}/startup.db")
+        env.setdefault("LOG_LEVEL", "WARNING")
+        report = run(args.runs, args.top, env)
+
+    output = args.output or RESULTS_DIR / f"startup-{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+
+    compared = compare_to_baseline(report, args.baseline)
+    for metric, result in report["results"].items():
+        line = f"{metric:<16} fastest {result['min_ms']:8.1f} ms  median {result['median_ms']:8.1f} ms"
+        check = compared.get(f"startup.{metric}")
+        if check is None:
+            line += "  no baseline"
+        else:
+            line += (f"  baseline {check['baseline']:8.1f} ms  {check['change']:+6.1f}% "
+                     f"(limit {check['threshold']:.0f}%)  {check['status']}")
+        print(line)
+    for name, top_packages in report["packages"].items():
+        print(f"\nslowest packages importing {IMPORT_TARGETS[name][0]}:")
+        for package, ms in top_packages.items():
+            print(f"  {package:<24} {ms:8.1f} ms")
+    print(f"\nreport written to {output}")
+
+    if any(check["status"] == "REGRESSION" for check in compared.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 from src.app.main import app
+from src.config.settings import get_settings
 
 if __name__ == "__main__":
+    # Single-process development server; production runs `python -m src.app.server`
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    # reload needs an import string, not the app object
+    uvicorn.run("src.app.main:app", host="127.0.0.1", port=8000, reload=True,
+                forwarded_allow_ips=get_settings().forwarded_allow_ips)
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from src.utils.profiling import PROFILE_TOKEN_HEADER, profile_store, verify_profile_token
+
+router = APIRouter()
+
+
+def require_profiling_admin(request: Request):
+    """Allow only requests carrying a valid profiling token"""
+    secret = request.app.state.settings.profiling_secret
+    if not secret:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profiling is not enabled"
+        )
+    if not verify_profile_token(secret, request.headers.get(PROFILE_TOKEN_HEADER)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Valid profiling token required"
+        )
+
+
+@router.get("/profiles", dependencies=[Depends(require_profiling_admin)])
+async def list_profiles():
+    """
+    List the stored request profiles, newest first.
+    """
+    return {"profiles": profile_store.summaries()}
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_profiling_admin)])
+async def get_profile(profile_id: str):
+    """
+    Get a stored profile with its top functions by cumulative time.
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return profile
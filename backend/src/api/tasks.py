@@ -1,25 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path, Body
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Body, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.session import get_session
 from src.services.task_service import TaskService
+from src.services.export_service import TaskExporter
+from src.services.import_service import IMPORT_BATCH_SIZE, TaskImporter
+from src.services.batch_service import TaskBatchService
 from src.auth.dependencies import get_current_user
-from src.schemas.task import TaskCreate, TaskUpdate, TaskRead, TaskListResponse, TaskToggleResponse, ErrorResponse
-from src.auth.exceptions import InvalidCredentialsException, InsufficientPermissionsException, ResourceNotFoundException
+from src.schemas.task import TaskCreate, TaskUpdate, TaskRead, TaskListResponse, ErrorResponse, \
+    BatchRequest, BatchResponse
+from src.auth.exceptions import InsufficientPermissionsException
 from src.utils.logging import log_security_event
+from src.utils.serialization import TASK_FIELDS, FastJSONResponse, parse_fields, task_response, task_list_response
 
 router = APIRouter()
 
+
+def get_task_fields(
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return, e.g. id,title,completed")
+) -> Optional[Tuple[str, ...]]:
+    """Parse the fields= sparse fieldset parameter; None means every field"""
+    try:
+        selected_fields = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return None if selected_fields == TASK_FIELDS else selected_fields
+
+
 @router.get("/{user_id}/tasks", response_model=TaskListResponse, responses={
     401: {"model": ErrorResponse, "description": "Unauthorized - invalid or expired JWT"},
     403: {"model": ErrorResponse, "description": "Forbidden - user_id in URL doesn't match authenticated user"},
     404: {"model": ErrorResponse, "description": "Not Found - user does not exist"}
 })
 async def get_user_tasks(
+    request: Request,
     user_id: str = Path(..., description="User ID to retrieve tasks for"),
+    fields: Optional[Tuple[str, ...]] = Depends(get_task_fields),
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_session)
 ):
@@ -42,25 +62,20 @@ async def get_user_tasks(
     task_service = TaskService(db)
 
     try:
+        # Let the database build the response body when enabled
+        if (fields is None and request.app.state.settings.db_json_aggregation
+                and task_service.supports_json_aggregation()):
+            body = await task_service.get_user_tasks_json(UUID(user_id))
+            return Response(content=body, media_type="application/json")
+
         # Get user's tasks
-        tasks = await task_service.get_user_tasks(UUID(user_id))
+        tasks = await task_service.get_user_tasks(UUID(user_id), fields=fields)
 
         # Get total count
         total_count = await task_service.get_user_task_count(UUID(user_id))
 
-        # Prepare response
-        task_list = [TaskRead.from_orm(task) if hasattr(TaskRead, 'from_orm') else
-                     TaskRead(
-                         id=task.id,
-                         title=task.title,
-                         description=task.description,
-                         completed=task.completed,
-                         user_id=str(task.user_id),
-                         created_at=task.created_at,
-                         updated_at=task.updated_at
-                     ) for task in tasks]
-
-        return TaskListResponse(tasks=task_list, total_count=total_count)
+        # Serialize rows straight to JSON in the TaskListResponse shape
+        return task_list_response(tasks, total_count, fields=fields or TASK_FIELDS)
 
     except Exception as e:
         log_security_event("FAILED_TASK_RETRIEVAL", str(e), user_id)
@@ -112,15 +127,7 @@ async def create_user_task(
         task = await task_service.create_task(task_create, UUID(user_id))
 
         # Return the created task
-        return TaskRead(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            completed=task.completed,
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at
-        )
+        return task_response(task)
 
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -134,6 +141,93 @@ async def create_user_task(
         )
 
 
+@router.get("/{user_id}/tasks/export", response_class=StreamingResponse, responses={
+    200: {"description": "Streamed NDJSON or CSV export of the user's tasks",
+          "content": {"application/x-ndjson": {}, "text/csv": {}}},
+    401: {"model": ErrorResponse, "description": "Unauthorized - invalid or expired JWT"},
+    403: {"model": ErrorResponse, "description": "Forbidden - user_id in URL doesn't match authenticated user"}
+})
+async def export_user_tasks(
+    request: Request,
+    user_id: str = Path(..., description="User ID to export tasks for"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$",
+                               description="Export format: ndjson or csv"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Export all tasks for the specified user.
+
+    Streams every task as NDJSON or CSV straight from a server-side cursor,
+    gzip-compressed on the fly when the client accepts it.
+    The authenticated user must match the user_id in the URL.
+    """
+    authenticated_user_id = current_user["user_id"]
+
+    # Verify that the authenticated user matches the requested user_id
+    if authenticated_user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: user_id in URL doesn't match authenticated user"
+        )
+
+    compress = "gzip" in request.headers.get("Accept-Encoding", "")
+    exporter = TaskExporter(UUID(user_id), export_format, compress=compress)
+
+    headers = {"Content-Disposition": f'attachment; filename="{exporter.filename}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
+    log_security_event("TASK_EXPORT", f"Task export started ({export_format})", user_id)
+    return StreamingResponse(exporter.stream(), media_type=exporter.media_type, headers=headers)
+
+
+@router.post("/{user_id}/tasks/import", responses={
+    200: {"description": "Import finished - counts and per-line errors"},
+    401: {"model": ErrorResponse, "description": "Unauthorized - invalid or expired JWT"},
+    403: {"model": ErrorResponse, "description": "Forbidden - user_id in URL doesn't match authenticated user"}
+})
+async def import_user_tasks(
+    request: Request,
+    user_id: str = Path(..., description="User ID to import tasks for"),
+    import_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$",
+                               description="Import format: ndjson or csv"),
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=5000, description="Rows inserted per transaction"),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Import tasks for the specified user from an NDJSON or CSV request body.
+
+    The body is read incrementally, each record is validated with the
+    TaskCreate rules and valid rows are inserted in batches. Invalid lines are
+    reported individually instead of failing the whole import.
+    The authenticated user must match the user_id in the URL.
+    """
+    authenticated_user_id = current_user["user_id"]
+
+    # Verify that the authenticated user matches the requested user_id
+    if authenticated_user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: user_id in URL doesn't match authenticated user"
+        )
+
+    importer = TaskImporter(db, UUID(user_id), import_format, batch_size=batch_size)
+
+    try:
+        report = await importer.run(request.stream())
+    except Exception as e:
+        log_security_event("FAILED_TASK_IMPORT", str(e), user_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while importing tasks"
+        )
+
+    log_security_event("TASK_IMPORT", f"Imported {report.imported} tasks, {report.failed} failed", user_id)
+    return report.to_dict()
+
+
 @router.get("/{user_id}/tasks/{task_id}", response_model=TaskRead, responses={
     200: {"model": TaskRead, "description": "Successful response with the requested task"},
     401: {"model": ErrorResponse, "description": "Unauthorized - invalid or expired JWT"},
@@ -143,6 +237,7 @@ async def create_user_task(
 async def get_user_task(
     user_id: str = Path(..., description="User ID that owns the task"),
     task_id: UUID = Path(..., description="Task ID to retrieve"),
+    fields: Optional[Tuple[str, ...]] = Depends(get_task_fields),
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_session)
 ):
@@ -166,18 +261,10 @@ async def get_user_task(
 
     try:
         # Get the specific task
-        task = await task_service.get_task_by_id(task_id, UUID(user_id))
+        task = await task_service.get_task_by_id(task_id, UUID(user_id), fields=fields)
 
         # Return the task
-        return TaskRead(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            completed=task.completed,
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at
-        )
+        return task_response(task, fields=fields or TASK_FIELDS)
 
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -229,15 +316,7 @@ async def update_user_task(
         task = await task_service.update_task(task_id, task_update, UUID(user_id))
 
         # Return the updated task
-        return TaskRead(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            completed=task.completed,
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at
-        )
+        return task_response(task)
 
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -335,15 +414,7 @@ async def complete_user_task(
         task = await task_service.toggle_task_completion(task_id, UUID(user_id))
 
         # Return the updated task
-        return TaskRead(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            completed=task.completed,
-            user_id=str(task.user_id),
-            created_at=task.created_at,
-            updated_at=task.updated_at
-        )
+        return task_response(task)
 
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -354,4 +425,47 @@ async def complete_user_task(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while toggling the task completion status"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/{user_id}/batch", response_model=BatchResponse, responses={
+    200: {"model": BatchResponse, "description": "Batch executed - per-operation results"},
+    401: {"model": ErrorResponse, "description": "Unauthorized - invalid or expired JWT"},
+    403: {"model": ErrorResponse, "description": "Forbidden - user_id in URL doesn't match authenticated user"},
+    422: {"model": ErrorResponse, "description": "Unprocessable Entity - validation errors"}
+})
+async def batch_user_tasks(
+    user_id: str = Path(..., description="User ID that owns the tasks"),
+    batch_request: BatchRequest = Body(...),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Execute several task operations in one request.
+
+    Runs an ordered list of create, update, toggle and delete operations in a
+    single session with one commit. With atomic=true any failure rolls back
+    the whole batch; otherwise only the failed operations are undone.
+    The authenticated user must match the user_id in the URL.
+    """
+    authenticated_user_id = current_user["user_id"]
+
+    # Verify that the authenticated user matches the requested user_id
+    if authenticated_user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: user_id in URL doesn't match authenticated user"
+        )
+
+    batch_service = TaskBatchService(db, UUID(user_id))
+
+    try:
+        result = await batch_service.execute(batch_request.operations, atomic=batch_request.atomic)
+    except Exception as e:
+        log_security_event("FAILED_TASK_BATCH", str(e), user_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while executing the batch"
+        )
+
+    return FastJSONResponse(result)
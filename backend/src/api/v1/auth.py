@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from datetime import timedelta
 from uuid import UUID
 
@@ -16,9 +16,15 @@ from src.utils.logging import log_security_event
 router = APIRouter()
 
 
+def get_client_ip(request: Request) -> str:
+    """Client address for security event logging"""
+    return request.client.host if request.client else "unknown"
+
+
 @router.post("/register", response_model=Token)
 async def register_user(
     user_create: UserCreate,
+    request: Request,
     db: AsyncSession = Depends(get_session)
 ):
     """
@@ -44,7 +50,8 @@ async def register_user(
         access_token_expires = timedelta(minutes=30)
         access_token = create_access_token(
             data={"user_id": str(user.id), "email": user.email},
-            expires_delta=access_token_expires
+            expires_delta=access_token_expires,
+            settings=request.app.state.settings
         )
 
         # Log successful registration
@@ -57,7 +64,7 @@ async def register_user(
         raise
 
     except Exception as e:
-        log_security_event("FAILED_USER_REGISTRATION", str(e), "unknown")
+        log_security_event("FAILED_USER_REGISTRATION", str(e), "unknown", ip=get_client_ip(request))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while registering the user"
@@ -67,6 +74,7 @@ async def register_user(
 @router.post("/login", response_model=Token)
 async def login_user(
     user_create: UserCreate,
+    request: Request,
     db: AsyncSession = Depends(get_session)
 ):
     """
@@ -81,13 +89,16 @@ async def login_user(
         user = await user_service.verify_password(user_create.email, user_create.password)
 
         if not user:
+            log_security_event("FAILED_USER_LOGIN", "Incorrect email or password", "unknown",
+                               ip=get_client_ip(request))
             raise InvalidCredentialsException(detail="Incorrect email or password")
 
         # Create access token
         access_token_expires = timedelta(minutes=30)
         access_token = create_access_token(
             data={"user_id": str(user.id), "email": user.email},
-            expires_delta=access_token_expires
+            expires_delta=access_token_expires,
+            settings=request.app.state.settings
         )
 
         # Log successful login
@@ -100,7 +111,7 @@ async def login_user(
         raise
 
     except Exception as e:
-        log_security_event("FAILED_USER_LOGIN", str(e), "unknown")
+        log_security_event("FAILED_USER_LOGIN", str(e), "unknown", ip=get_client_ip(request))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while logging in"
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from src.database.engine import engine
+from src.services.user_service import password_hasher
+from src.utils.logging import LogLevel, log_event
+
+
+async def prewarm_pool(connections: int):
+    """Open `connections` pooled connections at once, then return them to the pool"""
+    # Overflow connections are closed on return, so opening more than the pool keeps is wasted
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        connections = min(connections, size())
+    if connections <= 0:
+        return
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(engine.connect())
+            await conn.execute(text("SELECT 1"))
+
+
+async def warm_password_hasher():
+    """Load the passlib backend and start every executor thread"""
+    await asyncio.gather(*(password_hasher.hash("warm-up") for _ in range(password_hasher.max_workers)))
+
+
+async def warm_request_path(app: FastAPI):
+    """Send one request to /livez through the full middleware stack and router"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/livez", "raw_path": b"/livez", "root_path": "", "query_string": b"",
+        "headers": [], "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80), "app": app,
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def warm_up(app: FastAPI):
+    """Pay the first-request costs before the app reports ready"""
+    settings = app.state.settings
+    timings = {}
+
+    async def step(name: str, coro):
+        start = time.perf_counter()
+        await coro
+        timings[f"{name}_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+    start = time.perf_counter()
+    # Build every mapper's relationships and compiled loaders now, not on the first query
+    configure_mappers()
+    await step("db_pool", prewarm_pool(settings.db_pool_prewarm))
+    await step("password_hasher", warm_password_hasher())
+    await step("request_path", warm_request_path(app))
+
+    log_event(
+        event_type="STARTUP_WARM_UP",
+        message=f"Warm-up finished in {(time.perf_counter() - start) * 1000:.1f} ms",
+        level=LogLevel.INFO,
+        **timings
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up, then start the readiness probe so /readyz only turns ready once
+    the first requests no longer pay for connection setup, mapper
+    configuration or hash backend loading. On shutdown the probe, the hash
+    executor and the connection pool are shut down.
+    """
+    readiness_probe = app.state.readiness_probe
+
+    await warm_up(app)
+    readiness_probe.start()
+    try:
+        yield
+    finally:
+        await readiness_probe.stop()
+        password_hasher.shutdown()
+        await engine.dispose()
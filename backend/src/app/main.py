@@ -1,51 +1,163 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from typing import Optional
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from src.api import tasks
 from src.api.v1 import auth  # Keep auth at v1 for now
-from src.config.settings import get_settings
+from src.app.lifespan import lifespan
+from src.config.settings import Settings, get_settings
 from src.auth.middleware import AuthMiddleware
+from src.middleware.admission import AdmissionMiddleware
+from src.middleware.cors import add_cors_middleware
 from src.middleware.error_handler import add_error_handling_middleware
-
-# Initialize FastAPI app
-app = FastAPI(
-    title="Secure Todo API Backend",
-    description="RESTful API for task management with JWT authentication",
-    version="1.0.0"
+from src.middleware.metrics import MetricsMiddleware
+from src.middleware.rate_limit import (
+    RateLimit, RateLimitMiddleware, UserRateLimitMiddleware, auth_route_limits, create_rate_limit_store
 )
+from src.middleware.query_stats import QueryStatsMiddleware
+from src.middleware.server_timing import ServerTimingMiddleware
+from src.services.readiness_service import ReadinessProbe
+from src.utils.logging import setup_logging
+from src.utils.metrics import registry
 
-# Add error handling middleware first (top of the stack)
-add_error_handling_middleware(app)
+# Root, health and metrics endpoints served outside the API prefixes
+system_router = APIRouter()
 
-# Add authentication middleware first (before CORS)
-app.add_middleware(AuthMiddleware)
+@system_router.get("/")
+def read_root():
+    return {"message": "Secure Todo API Backend"}
 
-# Get settings
-settings = get_settings()
+@system_router.get("/health")
+async def health_check():
+    # Static check kept for existing monitors; /readyz reports dependency health
+    return {"status": "healthy", "service": "todo-api", "version": "1.0.0"}
 
-# Configure CORS middleware - allow frontend at port 3001
-allow_origins = settings.allowed_origins
-if settings.frontend_url:
-    if settings.frontend_url not in allow_origins:
-        allow_origins.append(settings.frontend_url)
+@system_router.get("/livez")
+async def liveness():
+    """The process is up and its event loop is serving requests"""
+    return {"status": "alive"}
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allow_origins,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "X-Requested-With"],
-)
+@system_router.get("/readyz")
+async def readiness(request: Request):
+    """Cached dependency checks; 503 until warm-up finishes, while the database is unreachable or the probe is stale"""
+    status = request.app.state.readiness_probe.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
 
-# Include API routes - updated to new structure
-app.include_router(tasks.router, prefix="/api", tags=["tasks"])
-app.include_router(auth.router, prefix="/api/v1", tags=["auth"])
+@system_router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of the in-process metrics registry"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
-@app.get("/")
-def read_root():
-    return {"message": "Secure Todo API Backend"}
 
-@app.get("/health")
-async def health_check():
-    # In a real application, you might want to check database connectivity, etc.
-    return {"status": "healthy", "service": "todo-api", "version": "1.0.0"}
\ No newline at end of file
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    Build the application: middleware, routers and the readiness probe.
+    Startup warm-up and shutdown are handled by src.app.lifespan.
+
+    Handlers read `settings` from app.state. The database engine and its SQL
+    instrumentation are process-wide and configured from the environment
+    when src.database.engine is imported.
+    """
+    settings = settings or get_settings()
+
+    # Route all logging through the non-blocking background writer
+    setup_logging(settings.log_level, log_file=settings.log_file or None, queue_size=settings.log_queue_size)
+
+    app = FastAPI(
+        title="Secure Todo API Backend",
+        description="RESTful API for task management with JWT authentication",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+    app.state.settings = settings
+    # Dependency checks for /readyz, started by the lifespan once warm-up is done
+    app.state.readiness_probe = ReadinessProbe(settings.readiness_probe_interval, settings.readiness_db_timeout)
+
+    # Shed load per route class before a request waits on the database pool;
+    # inside auth so requests with bad tokens are rejected without queueing
+    if settings.admission_control:
+        app.add_middleware(
+            AdmissionMiddleware,
+            read_limit=settings.admission_read_limit,
+            write_limit=settings.admission_write_limit,
+            auth_limit=settings.admission_auth_limit,
+            bulk_limit=settings.admission_bulk_limit,
+            queue_size=settings.admission_queue_size,
+            queue_timeout=settings.admission_queue_timeout
+        )
+
+    # Rate limits run before admission so over-limit clients never take a slot.
+    # Invalid limits fail here, at startup
+    if settings.rate_limit:
+        rate_limit_store = create_rate_limit_store(settings)
+        # The per-user budget, inside auth so the user is known
+        app.add_middleware(
+            UserRateLimitMiddleware,
+            user_limit=RateLimit.parse(settings.rate_limit_user),
+            store=rate_limit_store
+        )
+
+    # Add authentication middleware (before CORS)
+    app.add_middleware(AuthMiddleware, settings=settings)
+
+    # Per-address and login/register budgets, outside auth so requests with
+    # bad or missing tokens are limited too
+    if settings.rate_limit:
+        app.add_middleware(
+            RateLimitMiddleware,
+            ip_limit=RateLimit.parse(settings.rate_limit_ip),
+            route_limits=auth_route_limits(settings),
+            store=rate_limit_store
+        )
+
+    # Attribute SQL statements to the request that ran them
+    if settings.sql_instrumentation:
+        app.add_middleware(QueryStatsMiddleware)
+
+    # Add error handling middleware after auth so it wraps it - the last
+    # middleware added is the outermost one
+    add_error_handling_middleware(app)
+
+    # Opt-in timing breakdown for browser devtools; wraps error responses too
+    if settings.server_timing:
+        app.add_middleware(ServerTimingMiddleware)
+
+    # Profile requests carrying an admin token, or a sample of all requests.
+    # cProfile, pstats and the admin endpoints are only imported when enabled
+    if settings.profiling_sample_rate > 0 and not settings.profiling_secret:
+        # Sampled profiles could only be read through the admin endpoints
+        raise ValueError("PROFILING_SAMPLE_RATE needs PROFILING_SECRET to retrieve the profiles")
+    if settings.profiling_secret:
+        from src.middleware.profiling import ProfilingMiddleware
+
+        app.add_middleware(
+            ProfilingMiddleware,
+            secret=settings.profiling_secret,
+            sample_rate=settings.profiling_sample_rate,
+            top_n=settings.profiling_top_n
+        )
+
+    # Record request metrics around everything except CORS preflights
+    app.add_middleware(MetricsMiddleware)
+
+    # Add CORS middleware last so it is the outermost layer and answers
+    # preflight requests before error handling and auth run
+    add_cors_middleware(app, settings)
+
+    # Include API routes - updated to new structure
+    app.include_router(tasks.router, prefix="/api", tags=["tasks"])
+    app.include_router(auth.router, prefix="/api/v1", tags=["auth"])
+    app.include_router(system_router)
+
+    # The profile endpoints answer 404 without a secret, so skip loading them
+    if settings.profiling_secret:
+        from src.api import admin
+
+        app.include_router(admin.router, prefix="/admin", tags=["admin"])
+
+    return app
+
+
+# Module-level instance for `uvicorn src.app.main:app`
+app = create_app()
@@ -0,0 +1,406 @@
+"""
+Production server: a pre-forking master supervising uvicorn workers.
+
+    python -m src.app.server                      # one worker per CPU core on HOST:PORT
+    python -m src.app.server --workers 4 --port 8080
+
+The master imports the app once and then forks the workers, so they share
+the loaded code and data copy-on-write. Each worker binds its own listening
+socket with SO_REUSEPORT and the kernel spreads connections across them;
+where SO_REUSEPORT is unavailable the workers share one socket bound by the
+master. Workers run on uvloop and httptools when those are installed.
+
+A worker is replaced after MAX_REQUESTS requests, plus a random share of
+MAX_REQUESTS_JITTER so the workers don't all recycle together. It keeps
+serving until its replacement is up, so recycling never leaves the port
+without a listener. Connections still queued on the old worker's socket
+when it closes are reset unless the kernel migrates them to the other
+listeners - set net.ipv4.tcp_migrate_req=1 (Linux 5.14+). Workers that
+exit unexpectedly are restarted.
+
+Each worker keeps its own in-process state. /metrics reports the counters
+of the worker that answered, so every sample carries a pid label: sum or
+rate() across pids for the whole server, and expect a worker's series to
+end when it is recycled. Profiles (PROFILING_SECRET) are shared through a
+temporary directory, so /admin/profiles lists every worker's profiles.
+Rate limit buckets stay per worker unless RATE_LIMIT_STORE_URL is set.
+All processes append to LOG_FILE without rotating it, as each would rename
+the file under the others; rotate it externally, e.g. with logrotate.
+
+Behind a proxy or load balancer, list its addresses in FORWARDED_ALLOW_IPS.
+Otherwise every request seems to come from the proxy, and the per-address
+rate limits become one limit shared by all clients.
+
+SIGTERM or SIGINT drains: workers stop accepting, finish in-flight requests
+for up to GRACEFUL_TIMEOUT seconds and run the lifespan shutdown, and any
+still running after that are killed.
+
+backend/main.py stays the single-process development server with reload.
+"""
+
+import argparse
+import gc
+import os
+import random
+import select
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+import traceback
+from typing import Dict, List, Optional, Tuple
+
+import uvicorn
+
+from src.config.settings import get_settings
+from src.utils.logging import LogLevel, log_event, shutdown_logging, use_external_log_rotation
+
+# Exit status of a worker that failed to start; the master stops instead of respawning it
+WORKER_BOOT_ERROR = 3
+# A worker that crashes sooner than this after starting is respawned after a pause
+MIN_WORKER_LIFETIME = 1.0
+# Extra seconds the master waits for draining workers before killing them
+KILL_GRACE = 5.0
+LISTEN_BACKLOG = 2048
+
+# Messages a worker writes to its pipe to the master
+WORKER_READY = b"R"
+WORKER_RETIRING = b"X"
+
+
+def bind_socket(host: str, port: int, reuse_port: bool, listen: bool = True) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    if listen:
+        sock.listen(LISTEN_BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+def event_loop_and_http() -> Tuple[str, str]:
+    """uvloop and httptools when installed, otherwise asyncio and h11"""
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    return loop, http
+
+
+class WorkerServer(uvicorn.Server):
+    """
+    uvicorn server that reports to the master over a pipe: once when it is
+    serving, and once when it has handled max_requests. Instead of exiting at
+    the limit like uvicorn's limit_max_requests, it keeps serving until the
+    master stops it.
+    """
+
+    def __init__(self, config: uvicorn.Config, notify_fd: int, max_requests: Optional[int]):
+        super().__init__(config)
+        self.notify_fd = notify_fd
+        self.max_requests = max_requests
+        self.retiring = False
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets=sockets)
+        if self.started:
+            os.write(self.notify_fd, WORKER_READY)
+
+    async def on_tick(self, counter: int) -> bool:
+        if (self.max_requests and not self.retiring
+                and self.server_state.total_requests >= self.max_requests):
+            self.retiring = True
+            os.write(self.notify_fd, WORKER_RETIRING)
+        return await super().on_tick(counter)
+
+
+class WorkerProcess:
+    """The master's view of one forked worker"""
+
+    __slots__ = ("pid", "slot", "pipe", "started_at", "retiring")
+
+    def __init__(self, pid: int, slot: int, pipe: int):
+        self.pid = pid
+        self.slot = slot
+        self.pipe = pipe
+        self.started_at = time.monotonic()
+        self.retiring = False
+
+
+class Master:
+    """Forks the workers, recycles and restarts them, and drains them on shutdown"""
+
+    def __init__(self, app, host: str, port: int, workers: int, max_requests: int = 0,
+                 max_requests_jitter: int = 0, graceful_timeout: float = 30.0, access_log: bool = False,
+                 forwarded_allow_ips: str = "127.0.0.1"):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.worker_count = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.access_log = access_log
+        self.forwarded_allow_ips = forwarded_allow_ips
+
+        self.reuse_port = hasattr(socket, "SO_REUSEPORT")
+        self.socket: Optional[socket.socket] = None
+        self.workers: Dict[int, WorkerProcess] = {}
+        self.stopping = False
+        self.kill_deadline = 0.0
+        self.exit_code = 0
+
+    def run(self) -> int:
+        # Fail fast on a taken address. With SO_REUSEPORT this socket only
+        # reserves the port (and resolves port 0); the workers bind their own.
+        self.socket = bind_socket(self.host, self.port, self.reuse_port, listen=not self.reuse_port)
+        self.port = self.socket.getsockname()[1]
+        loop, http = event_loop_and_http()
+        log_event(
+            event_type="SERVER_START",
+            message=f"Starting {self.worker_count} workers on {self.host}:{self.port}",
+            level=LogLevel.INFO,
+            workers=self.worker_count,
+            reuse_port=self.reuse_port,
+            loop=loop,
+            http=http,
+            max_requests=self.max_requests
+        )
+
+        # Collect now and move everything loaded so far out of the collector's
+        # reach, so collections in the workers don't touch - and copy - shared pages
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        for slot in range(self.worker_count):
+            self.spawn(slot)
+
+        while self.workers:
+            self.read_messages(timeout=0.1)
+            self.reap()
+            if self.stopping and time.monotonic() > self.kill_deadline:
+                self.signal_workers(list(self.workers), signal.SIGKILL)
+
+        self.socket.close()
+        log_event(event_type="SERVER_STOP", message="All workers stopped", level=LogLevel.INFO)
+        return self.exit_code
+
+    def stop(self, signum=None, frame=None):
+        if self.stopping:
+            return
+        self.stopping = True
+        self.kill_deadline = time.monotonic() + self.graceful_timeout + KILL_GRACE
+        self.signal_workers(list(self.workers), signal.SIGTERM)
+
+    @staticmethod
+    def signal_workers(pids: List[int], signum: int):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def spawn(self, slot: int):
+        limit = None
+        if self.max_requests > 0:
+            limit = self.max_requests + random.randint(0, self.max_requests_jitter)
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid:
+            os.close(write_fd)
+            self.workers[pid] = WorkerProcess(pid, slot, read_fd)
+            return
+
+        # Worker process: never return into the master's loop
+        code = 1
+        try:
+            os.close(read_fd)
+            for worker in self.workers.values():
+                os.close(worker.pipe)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = self.run_worker(write_fd, limit)
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            # os._exit skips atexit, so flush the log writer here
+            shutdown_logging()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    def run_worker(self, notify_fd: int, limit: Optional[int]) -> int:
+        from src.database.engine import engine
+        from src.utils.metrics import registry
+
+        # Scrapes reach one worker at a time; keep each worker's series apart
+        registry.const_labels = {"pid": str(os.getpid())}
+
+        # Pooled connections must not cross fork(); drop any the master opened without closing them
+        engine.sync_engine.dispose(close=False)
+
+        if self.reuse_port:
+            self.socket.close()
+            sock = bind_socket(self.host, self.port, reuse_port=True)
+        else:
+            sock = self.socket
+
+        loop, http = event_loop_and_http()
+        config = uvicorn.Config(
+            self.app,
+            loop=loop,
+            http=http,
+            lifespan="on",
+            timeout_graceful_shutdown=int(self.graceful_timeout),
+            access_log=self.access_log,
+            # Take the client address from X-Forwarded-For only when a trusted proxy sent it
+            proxy_headers=True,
+            forwarded_allow_ips=self.forwarded_allow_ips,
+            # Keep the app's logging setup - uvicorn's records go through the same queue
+            log_config=None,
+        )
+        server = WorkerServer(config, notify_fd, limit)
+        server.run(sockets=[sock])
+        return 0 if server.started else WORKER_BOOT_ERROR
+
+    def read_messages(self, timeout: float):
+        pipes = {worker.pipe: worker for worker in self.workers.values()}
+        try:
+            readable, _, _ = select.select(list(pipes), [], [], timeout)
+        except InterruptedError:
+            return
+        for fd in readable:
+            worker = pipes[fd]
+            for message in os.read(fd, 64):
+                self.handle_message(worker, bytes([message]))
+
+    def handle_message(self, worker: WorkerProcess, message: bytes):
+        if self.stopping:
+            return
+        if message == WORKER_RETIRING and not worker.retiring:
+            # Start the replacement first; the old worker serves until it is up
+            worker.retiring = True
+            self.spawn(worker.slot)
+        elif message == WORKER_READY:
+            retired = [other.pid for other in self.workers.values()
+                       if other.slot == worker.slot and other.retiring]
+            self.signal_workers(retired, signal.SIGTERM)
+
+    def reap(self):
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                return
+            if pid == 0:
+                return
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            os.close(worker.pipe)
+            code = os.waitstatus_to_exitcode(status)
+            if self.stopping:
+                continue
+
+            if code == WORKER_BOOT_ERROR:
+                log_event(
+                    event_type="WORKER_BOOT_ERROR",
+                    message=f"Worker {pid} failed to start; shutting down",
+                    level=LogLevel.CRITICAL
+                )
+                self.exit_code = WORKER_BOOT_ERROR
+                self.stop()
+                continue
+
+            if worker.retiring and code == 0:
+                log_event(
+                    event_type="WORKER_RECYCLED",
+                    message=f"Worker {pid} recycled after reaching its request limit",
+                    level=LogLevel.INFO
+                )
+                continue
+
+            log_event(
+                event_type="WORKER_EXIT",
+                message=f"Worker {pid} exited unexpectedly with status {code}; starting a replacement",
+                level=LogLevel.ERROR,
+                exit_code=code
+            )
+            if time.monotonic() - worker.started_at < MIN_WORKER_LIFETIME:
+                # Don't spin on a worker that crashes right away
+                time.sleep(MIN_WORKER_LIFETIME)
+            # A retiring worker's replacement may already be running
+            if not any(other.slot == worker.slot for other in self.workers.values()):
+                self.spawn(worker.slot)
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=settings.host, help="bind address (HOST)")
+    parser.add_argument("--port", type=int, default=settings.port, help="bind port (PORT)")
+    parser.add_argument("--workers", type=int, default=settings.web_concurrency,
+                        help="worker processes, 0 for one per CPU core (WEB_CONCURRENCY)")
+    parser.add_argument("--max-requests", type=int, default=settings.max_requests,
+                        help="requests before a worker is replaced, 0 to disable (MAX_REQUESTS)")
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.max_requests_jitter,
+                        help="random extra requests per worker (MAX_REQUESTS_JITTER)")
+    parser.add_argument("--graceful-timeout", type=float, default=settings.graceful_timeout,
+                        help="seconds to finish in-flight requests on shutdown (GRACEFUL_TIMEOUT)")
+    parser.add_argument("--forwarded-allow-ips", default=settings.forwarded_allow_ips,
+                        help="comma-separated proxy addresses trusted for X-Forwarded-For (FORWARDED_ALLOW_IPS)")
+    parser.add_argument("--access-log", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    # Preload: import the app in the master so workers inherit it
+    from src.app.main import app
+
+    # The master and every worker append to LOG_FILE; none of them may rotate it
+    use_external_log_rotation()
+
+    # Each worker records the profiles of the requests it serves; share them
+    # so the admin endpoints answer the same whichever worker gets the request
+    profile_dir = None
+    if settings.profiling_secret:
+        from src.utils.profiling import profile_store
+
+        profile_dir = tempfile.mkdtemp(prefix="todo-profiles-")
+        profile_store.use_directory(profile_dir)
+
+    master = Master(
+        app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers or os.cpu_count() or 1,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        graceful_timeout=args.graceful_timeout,
+        access_log=args.access_log,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+    )
+    try:
+        code = master.run()
+    finally:
+        if profile_dir is not None:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,8 +16,26 @@ class AuthException(HTTPException):
     ):
         super().__init__(status_code=status_code, detail=detail, headers=headers)
         self.error_code = error_code
-        self.timestamp = datetime.utcnow().isoformat()
-        self.request_id = str(uuid.uuid4())
+        # Timestamp and request ID are produced lazily, most raised exceptions
+        # are rendered once and many are never logged at all
+        self._timestamp: Optional[str] = None
+        self._request_id: Optional[str] = None
+
+    @property
+    def timestamp(self) -> str:
+        if self._timestamp is None:
+            self._timestamp = datetime.utcnow().isoformat()
+        return self._timestamp
+
+    @property
+    def request_id(self) -> str:
+        if self._request_id is None:
+            self._request_id = str(uuid.uuid4())
+        return self._request_id
+
+    @request_id.setter
+    def request_id(self, value: str):
+        self._request_id = value
 
 
 class InvalidCredentialsException(AuthException):
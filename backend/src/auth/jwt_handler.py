@@ -6,9 +6,9 @@ from fastapi import HTTPException, status
 from src.config.settings import get_settings
 
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    """Create a new access token with the given data"""
-    settings = get_settings()
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None, settings=None):
+    """Create a new access token with the given data, signed with the app's settings (default: the environment's)"""
+    settings = settings or get_settings()
 
     to_encode = data.copy()
     if expires_delta:
@@ -21,9 +21,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def verify_token(token: str) -> dict:
+def verify_token(token: str, settings=None) -> dict:
     """Verify a JWT token and return the payload if valid"""
-    settings = get_settings()
+    settings = settings or get_settings()
 
     try:
         payload = jwt.decode(token, settings.better_auth_jwt_secret, algorithms=[settings.jwt_algorithm])
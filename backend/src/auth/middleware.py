@@ -1,10 +1,10 @@
 from fastapi import Request, HTTPException, status
 from fastapi.security.http import HTTPBearer, HTTPAuthorizationCredentials
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 from typing import Optional
 import re
 from src.auth.jwt_handler import verify_token, get_user_id_from_token_payload
+from src.utils.server_timing import timed
 
 
 class JWTBearer(HTTPBearer):
@@ -32,13 +32,21 @@ class JWTBearer(HTTPBearer):
         return verify_token(token)
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Authentication middleware to verify JWT tokens on protected routes"""
+class AuthMiddleware:
+    """
+    Authentication middleware to verify JWT tokens on protected routes.
+
+    Implemented as a raw ASGI middleware so streaming responses are not
+    buffered; errors are raised to the surrounding ErrorHandlerMiddleware.
+    """
 
     # Routes that don't require authentication
     excluded_routes = [
         "/",
         "/health",
+        "/livez",
+        "/readyz",
+        "/metrics",
         "/docs",
         "/redoc",
         "/openapi.json",
@@ -53,16 +61,25 @@ class AuthMiddleware(BaseHTTPMiddleware):
         "/api/auth/refresh",
     ]
 
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, settings=None):
+        self.app = app
+        # Settings the app was built with; None verifies against the environment's
+        self.settings = settings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         # Check if the route should be excluded from auth
         if (request.url.path in self.excluded_routes or
             self._is_openapi_route(request.url.path) or
-            self._is_auth_route(request.url.path)):
-            response = await call_next(request)
-            return response
+            self._is_auth_route(request.url.path) or
+            self._is_admin_route(request.url.path)):
+            await self.app(scope, receive, send)
+            return
 
         # Extract token from Authorization header
         auth_header = request.headers.get("Authorization")
@@ -76,8 +93,9 @@ class AuthMiddleware(BaseHTTPMiddleware):
 
         try:
             # Verify the token
-            payload = verify_token(token)
-            user_id = get_user_id_from_token_payload(payload)
+            with timed("auth"):
+                payload = verify_token(token, self.settings)
+                user_id = get_user_id_from_token_payload(payload)
 
             # Add user info to request state for use in route handlers
             request.state.user_id = user_id
@@ -93,8 +111,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
                 detail="Could not validate credentials"
             )
 
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
 
     def _is_openapi_route(self, path: str) -> bool:
         """Check if the route is an OpenAPI documentation route"""
@@ -127,4 +144,15 @@ class AuthMiddleware(BaseHTTPMiddleware):
         for pattern in auth_patterns:
             if re.match(pattern, path):
                 return True
-        return False
\ No newline at end of file
+        return False
+
+    def _is_admin_route(self, path: str) -> bool:
+        """Check if the route is an admin route, guarded by its own token instead of a user JWT"""
+        admin_patterns = [
+            r"/admin/profiles(/.*)?$",
+        ]
+
+        for pattern in admin_patterns:
+            if re.match(pattern, path):
+                return True
+        return False
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+from src.utils.server_timing import record_timing
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@lru_cache()
+def get_pwd_context() -> "CryptContext":
+    """
+    Password hashing context - using pbkdf2 instead of bcrypt to avoid byte
+    length issues. passlib takes tens of milliseconds to import, so it is
+    loaded on first use rather than when the app is imported.
+    """
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a dedicated thread pool.
+
+    pbkdf2 is deliberately slow CPU work; running it on the event loop stalls
+    every other request on the worker. The executor and, by default, the
+    passlib context are created lazily; simple counters feed the metrics and
+    readiness endpoints.
+    """
+
+    def __init__(self, context: Optional["CryptContext"] = None, max_workers: Optional[int] = None):
+        self._context = context
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Stats
+        self.submitted = {"hash": 0, "verify": 0}
+        self.completed = {"hash": 0, "verify": 0}
+        self.seconds = {"hash": 0.0, "verify": 0.0}
+
+    @property
+    def context(self) -> "CryptContext":
+        if self._context is None:
+            self._context = get_pwd_context()
+        return self._context
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    @property
+    def in_flight(self) -> int:
+        """Operations submitted but not finished - queued or running"""
+        return sum(self.submitted.values()) - sum(self.completed.values())
+
+    async def _run(self, op: str, func, *args):
+        self.submitted[op] += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.completed[op] += 1
+            self.seconds[op] += elapsed
+            record_timing("hash", elapsed)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run("verify", self.context.verify, password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import List
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -20,10 +21,82 @@ class Settings(BaseSettings):
 
     # Logging Configuration
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
+    # Optional rotating log file, written by the background log writer. Not rotated
+    # under the pre-forking server (src.app.server); rotate it externally there
+    log_file: str = Field(default="", env="LOG_FILE")
+    # Records beyond this many pending are dropped (and counted) instead of blocking
+    log_queue_size: int = Field(default=10000, env="LOG_QUEUE_SIZE")
 
     # Environment
     environment: str = Field(default="development", env="ENVIRONMENT")
 
+    # Performance
+    # Let the database build task list response bodies (Postgres and SQLite only)
+    db_json_aggregation: bool = Field(default=False, env="DB_JSON_AGGREGATION")
+    # Per-request SQL statistics, slow-query log and N+1 warnings
+    sql_instrumentation: bool = Field(default=True, env="SQL_INSTRUMENTATION")
+    slow_query_threshold_ms: int = Field(default=100, env="SLOW_QUERY_THRESHOLD_MS")
+    n_plus_one_threshold: int = Field(default=10, env="N_PLUS_ONE_THRESHOLD")
+    # Add a Server-Timing header with the auth/db/hash/serialize breakdown
+    server_timing: bool = Field(default=False, env="SERVER_TIMING")
 
+    # Admission control: concurrent requests per route class, each with a bounded wait queue.
+    # Reads, writes and bulk transfers match the 15 connections the default pool hands out
+    # (5 + 10 overflow), so excess requests wait here with a deadline instead of in pool checkout
+    admission_control: bool = Field(default=True, env="ADMISSION_CONTROL")
+    admission_read_limit: int = Field(default=8, env="ADMISSION_READ_LIMIT")
+    admission_write_limit: int = Field(default=5, env="ADMISSION_WRITE_LIMIT")
+    # Streaming task export and import, which hold a slot and a connection for the whole transfer
+    admission_bulk_limit: int = Field(default=2, env="ADMISSION_BULK_LIMIT")
+    # Login and register; hashing runs on a small executor, so more would only queue there
+    admission_auth_limit: int = Field(default=4, env="ADMISSION_AUTH_LIMIT")
+    admission_queue_size: int = Field(default=100, env="ADMISSION_QUEUE_SIZE")
+    # Seconds a request may wait for a slot before it is shed with a 503
+    admission_queue_timeout: float = Field(default=1.0, env="ADMISSION_QUEUE_TIMEOUT")
+
+    # Rate limiting: token buckets given as "<requests>/<second|minute|hour|day or seconds>".
+    # Every /api request counts against its client address and, once authenticated, its user;
+    # login and register also have their own much smaller per-address budgets
+    rate_limit: bool = Field(default=True, env="RATE_LIMIT")
+    rate_limit_user: str = Field(default="600/minute", env="RATE_LIMIT_USER")
+    # Higher than per user: several users may share an address behind NAT.
+    # Behind a proxy this needs FORWARDED_ALLOW_IPS, or all clients share the proxy's bucket
+    rate_limit_ip: str = Field(default="1200/minute", env="RATE_LIMIT_IP")
+    rate_limit_login: str = Field(default="10/minute", env="RATE_LIMIT_LOGIN")
+    rate_limit_register: str = Field(default="5/minute", env="RATE_LIMIT_REGISTER")
+    # redis:// URL to share buckets between workers and instances; empty keeps them per process
+    rate_limit_store_url: str = Field(default="", env="RATE_LIMIT_STORE_URL")
+
+    # Readiness probe: dependency checks run in the background this often (seconds)
+    readiness_probe_interval: float = Field(default=5.0, env="READINESS_PROBE_INTERVAL")
+    readiness_db_timeout: float = Field(default=2.0, env="READINESS_DB_TIMEOUT")
+    # Connections opened at startup, before /readyz reports ready; 0 skips pool warm-up
+    db_pool_prewarm: int = Field(default=5, env="DB_POOL_PREWARM")
+
+    # Production server (python -m src.app.server)
+    host: str = Field(default="0.0.0.0", env="HOST")
+    port: int = Field(default=8000, env="PORT")
+    # Worker processes; 0 means one per CPU core
+    web_concurrency: int = Field(default=0, env="WEB_CONCURRENCY")
+    # Restart a worker after this many requests (plus up to the jitter) to bound memory growth; 0 disables
+    max_requests: int = Field(default=10000, env="MAX_REQUESTS")
+    max_requests_jitter: int = Field(default=1000, env="MAX_REQUESTS_JITTER")
+    # Seconds a stopping worker may spend finishing in-flight requests
+    graceful_timeout: float = Field(default=30.0, env="GRACEFUL_TIMEOUT")
+    # Comma-separated proxy addresses whose X-Forwarded-For is trusted for the client address,
+    # which the per-address rate limits key on. "*" trusts any sender - only safe when the
+    # app can't be reached except through the proxy
+    forwarded_allow_ips: str = Field(default="127.0.0.1", env="FORWARDED_ALLOW_IPS")
+
+    # Profiling
+    # Secret for the X-Profile-Token header and the /admin/profiles endpoints; empty disables both
+    profiling_secret: str = Field(default="", env="PROFILING_SECRET")
+    # Fraction of requests profiled without a token; needs PROFILING_SECRET to read them
+    profiling_sample_rate: float = Field(default=0.0, env="PROFILING_SAMPLE_RATE")
+    profiling_top_n: int = Field(default=30, env="PROFILING_TOP_N")
+
+
+@lru_cache()
 def get_settings() -> Settings:
-    return Settings()
\ No newline at end of file
+    # Cached - settings are read on hot paths such as token verification
+    return Settings()
@@ -1,15 +1,32 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from sqlmodel import SQLModel
 import os
 from typing import AsyncGenerator
 
+from src.config.settings import get_settings
+from src.database.instrumentation import QueryInstrumentation
+
 # Get database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./todo_app.db")
 
 # Create async engine
 engine = create_async_engine(DATABASE_URL, echo=False)
 
+# Readiness pings connect on their own rather than queue behind requests for
+# a pooled connection; a full pool is reported separately, not as the database down
+probe_engine = create_async_engine(DATABASE_URL, echo=False, poolclass=NullPool)
+
+# Time every statement and attribute it to the current request
+_settings = get_settings()
+query_instrumentation = QueryInstrumentation(
+    slow_query_threshold=_settings.slow_query_threshold_ms / 1000,
+    n_plus_one_threshold=_settings.n_plus_one_threshold
+)
+if _settings.sql_instrumentation:
+    query_instrumentation.install(engine.sync_engine)
+
 # Create async session maker
 AsyncSessionLocal = sessionmaker(
     autocommit=False,
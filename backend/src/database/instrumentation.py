@@ -0,0 +1,148 @@
+import re
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.utils.logging import LogLevel, log_event
+
+
+# Defaults, overridable through settings (SLOW_QUERY_THRESHOLD_MS, N_PLUS_ONE_THRESHOLD)
+SLOW_QUERY_THRESHOLD = 0.1  # seconds
+N_PLUS_ONE_THRESHOLD = 10  # executions of one statement shape per request
+
+_STATEMENT_LENGTH = 500
+_PLACEHOLDER = r"\s*(?:\?|\$\d+|%\(\w+\)s)(?:::\w+)?\s*"
+_IN_LIST = re.compile(rf"\((?:{_PLACEHOLDER},)+{_PLACEHOLDER}\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """SQL statistics for a single request"""
+
+    __slots__ = ("method", "path", "count", "duration", "slowest_duration", "slowest_statement",
+                 "shapes", "flagged")
+
+    def __init__(self, method: str = "", path: str = ""):
+        self.method = method
+        self.path = path
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Dict[str, int] = {}
+        self.flagged = set()
+
+    def record(self, shape: str, duration: float) -> int:
+        """Count one statement; returns how many times this shape has run in the request"""
+        self.count += 1
+        self.duration += duration
+        if duration > self.slowest_duration:
+            self.slowest_duration = duration
+            self.slowest_statement = shape
+        executions = self.shapes.get(shape, 0) + 1
+        self.shapes[shape] = executions
+        return executions
+
+    def as_dict(self) -> dict:
+        return {
+            "queries": self.count,
+            "db_time_ms": round(self.duration * 1000, 3),
+            "slowest_ms": round(self.slowest_duration * 1000, 3),
+            "slowest_statement": self.slowest_statement,
+        }
+
+
+# Statistics of the request being served; None outside a request (scripts, startup)
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+@lru_cache(maxsize=1024)
+def statement_shape(statement: str) -> str:
+    """
+    Normalized statement text used to group executions.
+
+    Statements are already parameterized; this only folds whitespace and
+    expanded IN lists so `IN (?, ?)` and `IN (?, ?, ?)` count as one shape.
+    """
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _IN_LIST.sub("(...)", shape)
+    return shape[:_STATEMENT_LENGTH]
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Replace bound values with their type names so slow-query logs never carry user data"""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class QueryInstrumentation:
+    """
+    Cursor-level event hooks timing every statement run on an engine.
+
+    Timings are attributed to the QueryStats in current_query_stats, statements
+    over the slow threshold are logged with redacted parameters, and a warning
+    is logged once per request for any statement shape executed more than
+    n_plus_one_threshold times.
+    """
+
+    def __init__(self, slow_query_threshold: float = SLOW_QUERY_THRESHOLD,
+                 n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.slow_query_threshold = slow_query_threshold
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    def install(self, engine: Engine):
+        event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self.after_cursor_execute)
+
+    def remove(self, engine: Engine):
+        event.remove(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self.after_cursor_execute)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start_times = conn.info.get("query_start_time")
+        if not start_times:
+            return
+        duration = time.perf_counter() - start_times.pop()
+
+        stats = current_query_stats.get()
+        if stats is None and duration < self.slow_query_threshold:
+            return
+
+        shape = statement_shape(statement)
+
+        if stats is not None:
+            executions = stats.record(shape, duration)
+            if executions > self.n_plus_one_threshold and shape not in stats.flagged:
+                stats.flagged.add(shape)
+                log_event(
+                    event_type="POSSIBLE_N_PLUS_ONE",
+                    message=f"Statement executed more than {self.n_plus_one_threshold} times in one request",
+                    level=LogLevel.WARNING,
+                    method=stats.method,
+                    path=stats.path,
+                    statement=shape
+                )
+
+        if duration >= self.slow_query_threshold:
+            log_event(
+                event_type="SLOW_QUERY",
+                message=f"Statement took {duration * 1000:.1f} ms",
+                level=LogLevel.WARNING,
+                duration_ms=round(duration * 1000, 3),
+                statement=shape,
+                parameters=redact_parameters(parameters, executemany),
+                method=stats.method if stats is not None else None,
+                path=stats.path if stats is not None else None
+            )
@@ -0,0 +1,183 @@
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.models.task import Task
+from src.models.user import User
+
+
+SEED_PASSWORD = "seed-password"
+SEED_BATCH_SIZE = 10000
+# Timestamps are spread over the year before this date, so the same seed gives the same rows
+SEED_EPOCH = datetime(2026, 1, 1)
+SEED_HISTORY_DAYS = 365
+
+USER_COLUMNS = ("id", "email", "hashed_password", "name", "created_at", "updated_at")
+TASK_COLUMNS = ("id", "user_id", "title", "description", "completed", "created_at", "updated_at")
+
+_VERBS = ("Buy", "Call", "Email", "Review", "Fix", "Plan", "Write", "Book", "Clean", "Pay",
+          "Schedule", "Prepare", "Update", "Order", "Read", "Finish", "Submit", "Organize")
+_OBJECTS = ("groceries", "the dentist", "quarterly report", "flight tickets", "garage", "rent",
+            "team meeting", "blog post", "car insurance", "birthday gift", "pull request",
+            "tax documents", "project proposal", "kitchen", "library books", "invoice",
+            "weekly newsletter", "gym membership", "presentation slides", "vet appointment")
+_DETAILS = ("before Friday", "for next week", "with Alex", "and follow up", "asap",
+            "- check the notes first", "(second attempt)", "for the offsite", "")
+_DESCRIPTIONS = ("Need to buy milk, bread, and eggs", "Remember to bring the receipts",
+                 "Discussed in the last standup", "Low priority, but do not forget",
+                 "See the shared document for details", "Split into smaller steps if needed")
+
+
+def skewed_task_counts(users: int, total_tasks: int, skew: float) -> List[int]:
+    """
+    Split total_tasks across users following a power law: user i gets a
+    share proportional to 1 / (i + 1) ** skew, so a few power users own most
+    tasks and the long tail has a handful each. skew=0 is uniform.
+    """
+    if users <= 0:
+        return []
+    weights = [1 / (rank + 1) ** skew for rank in range(users)]
+    scale = total_tasks / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    # Hand the rounding remainder to the heaviest users
+    for rank in range(total_tasks - sum(counts)):
+        counts[rank % users] += 1
+    return counts
+
+
+class SeedDataGenerator:
+    """Deterministic generator of realistic user and task rows"""
+
+    def __init__(self, seed: int, hashed_password: str, epoch: datetime = SEED_EPOCH):
+        self.rng = random.Random(seed)
+        self.hashed_password = hashed_password
+        self.epoch = epoch
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _timestamp(self) -> datetime:
+        return self.epoch - timedelta(seconds=self.rng.randrange(SEED_HISTORY_DAYS * 86400))
+
+    def users(self, count: int) -> List[dict]:
+        rows = []
+        for i in range(count):
+            created_at = self._timestamp()
+            rows.append({
+                "id": self._uuid(),
+                "email": f"user{i:07d}@example.com",
+                "hashed_password": self.hashed_password,
+                "name": f"Seed User {i}",
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+        return rows
+
+    def tasks(self, user_id: uuid.UUID, count: int) -> Iterator[dict]:
+        rng = self.rng
+        for _ in range(count):
+            created_at = self._timestamp()
+            completed = rng.random() < 0.4
+            detail = rng.choice(_DETAILS)
+            yield {
+                "id": self._uuid(),
+                "user_id": user_id,
+                "title": f"{rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {detail}".rstrip(),
+                "description": rng.choice(_DESCRIPTIONS) if rng.random() < 0.6 else None,
+                "completed": completed,
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(seconds=rng.randrange(86400 * 14)) if completed else created_at,
+            }
+
+
+class SeedProgress:
+    """Prints rows written and rows per second at most every `interval` seconds"""
+
+    def __init__(self, label: str, total: int, interval: float = 1.0, stream=sys.stderr):
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.stream = stream
+        self.done = 0
+        self.start = time.perf_counter()
+        self._last_report = self.start
+
+    def advance(self, rows: int):
+        self.done += rows
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval or self.done >= self.total:
+            self._last_report = now
+            self.report(now)
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.start
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def report(self, now: Optional[float] = None):
+        percent = self.done / self.total * 100 if self.total else 100.0
+        print(f"{self.label}: {self.done:,}/{self.total:,} ({percent:5.1f}%) {self.rate:,.0f} rows/s",
+              file=self.stream, flush=True)
+
+
+async def _copy_rows(conn, table: str, columns, rows: List[dict]):
+    """COPY rows into a Postgres table through the underlying asyncpg connection"""
+    raw = await conn.get_raw_connection()
+    records = [tuple(row[column] for column in columns) for row in rows]
+    await raw.driver_connection.copy_records_to_table(table, records=records, columns=list(columns))
+
+
+async def seed_database(engine: AsyncEngine, users: int, tasks: int, skew: float = 1.1, seed: int = 42,
+                        batch_size: int = SEED_BATCH_SIZE, hashed_password: str = "",
+                        progress: Callable[[str, int], SeedProgress] = SeedProgress) -> dict:
+    """
+    Insert `users` users and `tasks` tasks spread over them with a skewed
+    distribution. Rows are written in batches of batch_size, each batch in its
+    own transaction: with COPY on Postgres, with multi-row executemany inserts
+    elsewhere. Returns row counts, elapsed time and throughput.
+    """
+    generator = SeedDataGenerator(seed, hashed_password)
+    use_copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "asyncpg"
+    start = time.perf_counter()
+
+    async def write(table, columns, rows: List[dict]):
+        async with engine.begin() as conn:
+            if use_copy:
+                await _copy_rows(conn, table.__tablename__, columns, rows)
+            else:
+                await conn.execute(insert(table), rows)
+
+    user_rows = generator.users(users)
+    user_progress = progress("users", users)
+    for offset in range(0, users, batch_size):
+        batch = user_rows[offset:offset + batch_size]
+        await write(User, USER_COLUMNS, batch)
+        user_progress.advance(len(batch))
+
+    task_progress = progress("tasks", tasks)
+    batch: List[dict] = []
+    for user, count in zip(user_rows, skewed_task_counts(users, tasks, skew)):
+        for row in generator.tasks(user["id"], count):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                await write(Task, TASK_COLUMNS, batch)
+                task_progress.advance(len(batch))
+                batch = []
+    if batch:
+        await write(Task, TASK_COLUMNS, batch)
+        task_progress.advance(len(batch))
+
+    elapsed = time.perf_counter() - start
+    return {
+        "users": users,
+        "tasks": tasks,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round((users + tasks) / elapsed) if elapsed > 0 else 0,
+        "method": "copy" if use_copy else "insert",
+    }
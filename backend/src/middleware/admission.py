@@ -0,0 +1,170 @@
+from collections import deque
+from typing import Deque, Dict, Optional
+import asyncio
+import time
+
+from fastapi import HTTPException, status
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.utils.metrics import (
+    admission_in_flight, admission_queue_depth, admission_queue_wait_seconds, admission_rejected_total
+)
+
+
+# Seconds clients are told to wait before retrying a shed request
+RETRY_AFTER_SECONDS = 1
+
+# Login and register spend most of their time hashing passwords
+AUTH_HASH_ROUTES = frozenset({
+    "/api/v1/login",
+    "/api/v1/register",
+    "/api/auth/login",
+    "/api/auth/register",
+})
+READ_METHODS = frozenset({"GET", "HEAD"})
+# Streaming export and import hold their slot for the whole transfer, which can take minutes
+BULK_ROUTE_SUFFIXES = ("/tasks/export", "/tasks/import")
+
+
+def route_class(scope: Scope) -> Optional[str]:
+    """
+    Admission class of a request: "auth", "bulk", "read" or "write". Requests
+    outside /api - health checks, metrics, docs, admin - are never limited.
+    """
+    path = scope["path"]
+    if not path.startswith("/api/") or scope["method"] == "OPTIONS":
+        return None
+    if path in AUTH_HASH_ROUTES:
+        return "auth"
+    if path.endswith(BULK_ROUTE_SUFFIXES):
+        return "bulk"
+    return "read" if scope["method"] in READ_METHODS else "write"
+
+
+class ConcurrencyLimiter:
+    """
+    At most `limit` holders at once, with up to `queue_size` waiters served
+    in arrival order. A waiter that is not admitted within `queue_timeout`
+    seconds gives up, so waiting time is bounded.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _update_gauges(self):
+        admission_in_flight.set(self.active, self.name)
+        admission_queue_depth.set(len(self._waiters), self.name)
+
+    async def acquire(self) -> Optional[str]:
+        """Take a slot; returns None when admitted, else why not ("queue_full" or "timeout")"""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self._update_gauges()
+            return None
+        if len(self._waiters) >= self.queue_size:
+            return "queue_full"
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        start = time.perf_counter()
+        timer = loop.call_later(self.queue_timeout, self._expire, waiter)
+        try:
+            admitted = await waiter
+        except asyncio.CancelledError:
+            # The client went away; hand on a slot that was granted in the meantime
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release()
+            else:
+                self._remove(waiter)
+            raise
+        finally:
+            timer.cancel()
+
+        if not admitted:
+            return "timeout"
+        admission_queue_wait_seconds.observe(time.perf_counter() - start, self.name)
+        return None
+
+    def release(self):
+        # Hand the slot straight to the next live waiter, keeping arrival order
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                self._update_gauges()
+                return
+        self.active -= 1
+        self._update_gauges()
+
+    def _expire(self, waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(False)
+            self._remove(waiter)
+
+    def _remove(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._update_gauges()
+
+
+class AdmissionMiddleware:
+    """
+    Concurrency limits per route class, in front of the database pool.
+
+    When the database slows down, requests otherwise pile up waiting for a
+    pooled connection until they all time out. Here each class - reads,
+    writes, password-hashing auth routes and streaming bulk transfers - has
+    its own limit and a bounded wait queue with a deadline; a request that
+    cannot get a slot in time is rejected with 503 and Retry-After, so
+    overload fails fast while admitted requests keep their latency. Long
+    exports and imports only compete with each other, never with short
+    reads and writes. The 503 is raised to the surrounding
+    ErrorHandlerMiddleware.
+    """
+
+    def __init__(self, app: ASGIApp, read_limit: int, write_limit: int, auth_limit: int,
+                 bulk_limit: int, queue_size: int, queue_timeout: float):
+        self.app = app
+        self.limiters: Dict[str, ConcurrencyLimiter] = {
+            name: ConcurrencyLimiter(name, limit, queue_size, queue_timeout)
+            for name, limit in (("read", read_limit), ("write", write_limit), ("auth", auth_limit),
+                                ("bulk", bulk_limit))
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        name = route_class(scope)
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[name]
+        rejected = await limiter.acquire()
+        if rejected is not None:
+            admission_rejected_total.inc(name, rejected)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, retry later",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+            )
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -1,25 +1,155 @@
-from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, List, Optional, Sequence
 from src.config.settings import get_settings
 
 
-def add_cors_middleware(app):
+ALLOW_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+ALLOW_HEADERS = ["Authorization", "Content-Type", "X-Requested-With", "X-Client-Type", "X-Request-ID"]
+# Expose headers that frontend may need to access
+EXPOSE_HEADERS = [
+    "Access-Control-Allow-Origin", "Access-Control-Allow-Credentials", "X-Request-ID", "Server-Timing",
+    "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After",
+]
+# Set max age to reduce preflight requests
+PREFLIGHT_MAX_AGE = 86400  # 24 hours
+
+
+class CORSMiddleware:
+    """
+    CORS middleware meant to sit at the outer edge of the stack.
+
+    Preflight requests are answered immediately, without reaching the error
+    handling or authentication layers, using a header set precomputed once
+    per allowed origin. Actual requests get the simple CORS headers appended
+    to the response start message.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Sequence[str] = (),
+        allow_methods: Sequence[str] = ALLOW_METHODS,
+        allow_headers: Sequence[str] = ALLOW_HEADERS,
+        expose_headers: Sequence[str] = EXPOSE_HEADERS,
+        allow_credentials: bool = True,
+        max_age: int = PREFLIGHT_MAX_AGE,
+    ):
+        self.app = app
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_credentials = allow_credentials
+
+        # Headers shared by every allowed origin, encoded once
+        self._preflight_template = [
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-allow-headers", ", ".join(allow_headers).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"vary", b"Origin"),
+            (b"content-length", b"0"),
+        ]
+        self._simple_template: Dict[str, str] = {}
+        if expose_headers:
+            self._simple_template["Access-Control-Expose-Headers"] = ", ".join(expose_headers)
+        if allow_credentials:
+            self._preflight_template.append((b"access-control-allow-credentials", b"true"))
+            self._simple_template["Access-Control-Allow-Credentials"] = "true"
+
+        self._preflight_headers: Dict[str, List[tuple]] = {}
+        for origin in allow_origins:
+            if origin != "*":
+                self._preflight_headers[origin] = self._build_preflight_headers(origin)
+
+    def _build_preflight_headers(self, origin: str) -> List[tuple]:
+        return [(b"access-control-allow-origin", origin.encode("latin-1"))] + self._preflight_template
+
+    def _get_preflight_headers(self, origin: str) -> Optional[List[tuple]]:
+        headers = self._preflight_headers.get(origin)
+        if headers is None and self.allow_all_origins:
+            headers = self._build_preflight_headers(origin)
+        return headers
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        return self.allow_all_origins or origin in self._preflight_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        is_preflight = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value.decode("latin-1")
+            elif name == b"access-control-request-method":
+                is_preflight = scope["method"] == "OPTIONS"
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if is_preflight:
+            await self.preflight_response(origin, send)
+            return
+
+        if not self.is_allowed_origin(origin):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["Access-Control-Allow-Origin"] = origin
+                for key, value in self._simple_template.items():
+                    headers[key] = value
+                headers.add_vary_header("Origin")
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def preflight_response(self, origin: str, send: Send) -> None:
+        headers = self._get_preflight_headers(origin)
+        if headers is None:
+            body = b"Disallowed CORS origin"
+            await send({
+                "type": "http.response.start",
+                "status": 400,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"vary", b"Origin"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        await send({"type": "http.response.start", "status": 204, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def get_allowed_origins(settings=None) -> List[str]:
+    """Allowed origins from settings, including the configured frontend URL"""
+    settings = settings or get_settings()
+
+    allow_origins = list(settings.allowed_origins)
+    if settings.frontend_url and settings.frontend_url not in allow_origins:
+        allow_origins.append(settings.frontend_url)
+    return allow_origins
+
+
+def add_cors_middleware(app, settings=None):
     """
     Add CORS middleware to the FastAPI application
     This allows the frontend to make requests to the backend
-    """
-    settings = get_settings()
 
+    Must be the last middleware added so that it is the outermost layer and
+    preflight requests never reach error handling or authentication.
+    """
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.allowed_origins,
+        allow_origins=get_allowed_origins(settings),
         allow_credentials=True,
-        allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-        allow_headers=["Authorization", "Content-Type", "X-Requested-With", "X-Client-Type"],
-        # Expose headers that frontend may need to access
-        expose_headers=["Access-Control-Allow-Origin", "Access-Control-Allow-Credentials"],
-        # Set max age to reduce preflight requests
-        max_age=86400,  # 24 hours
+        max_age=PREFLIGHT_MAX_AGE,
     )
 
-    return app
\ No newline at end of file
+    return app
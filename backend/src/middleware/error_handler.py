@@ -1,87 +1,126 @@
-from fastapi import Request, HTTPException
+from fastapi import HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Optional
 import traceback
 import logging
 from datetime import datetime
 import uuid
 
-from src.auth.exceptions import AuthException, InvalidCredentialsException, ExpiredTokenException, \
-    InsufficientPermissionsException, ResourceNotFoundException, ValidationErrorException, \
-    InternalServerErrorException, create_error_response
+from src.auth.exceptions import AuthException
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
-    """Comprehensive error handling middleware for the application"""
+# Map some error codes to our standard format
+ERROR_CODE_MAP = {
+    400: "REQ_001",  # Malformed request
+    401: "AUTH_001",  # Invalid credentials
+    403: "AUTH_003",  # Insufficient permissions
+    404: "DATA_001",  # Resource not found
+    422: "DATA_002",  # Validation error
+    429: "REQ_002",  # Rate limit exceeded
+    500: "SYS_001",  # Internal server error
+    503: "SYS_002"   # Overloaded, shed by admission control
+}
 
-    def __init__(self, app):
-        super().__init__(app)
+REQUEST_ID_HEADER = b"x-request-id"
+
+
+def get_incoming_request_id(scope: Scope) -> Optional[str]:
+    """Return the caller-supplied X-Request-ID header, if any"""
+    for name, value in scope.get("headers", ()):
+        if name == REQUEST_ID_HEADER:
+            return value.decode("latin-1")
+    return None
+
+
+class ErrorHandlerMiddleware:
+    """
+    Comprehensive error handling middleware for the application.
+
+    Implemented as a raw ASGI middleware so that response bodies (including
+    streaming responses) are passed through untouched. Request IDs and
+    timestamps are only produced when an error response is actually rendered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.logger = logging.getLogger(__name__)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
-        except AuthException as e:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            if response_started:
+                # Headers are already on the wire, nothing sensible can be sent
+                raise
+            response = self.build_error_response(scope, e)
+            await response(scope, receive, send)
+
+    def build_error_response(self, scope: Scope, exc: Exception) -> JSONResponse:
+        """Render an exception using the standard error JSON contract"""
+        request_id = get_incoming_request_id(scope)
+
+        if isinstance(exc, AuthException):
             # Handle custom authentication exceptions
-            self.logger.warning(f"Auth error: {e.detail} (Request ID: {getattr(e, 'request_id', 'unknown')})")
+            if request_id:
+                exc.request_id = request_id
+            self.logger.warning(f"Auth error: {exc.detail} (Request ID: {exc.request_id})")
 
             error_response = {
-                "detail": e.detail,
-                "error_code": e.error_code,
-                "timestamp": e.timestamp,
-                "request_id": e.request_id
+                "detail": exc.detail,
+                "error_code": exc.error_code,
+                "timestamp": exc.timestamp,
+                "request_id": exc.request_id
             }
-            return JSONResponse(status_code=e.status_code, content=error_response)
+            return self._json(exc.status_code, error_response, exc.request_id, exc.headers)
 
-        except HTTPException as e:
-            # Handle standard HTTP exceptions
-            request_id = str(uuid.uuid4())
-            timestamp = datetime.utcnow().isoformat()
-
-            self.logger.info(f"HTTP error {e.status_code}: {e.detail} (Request ID: {request_id})")
-
-            # Map some error codes to our standard format
-            error_code_map = {
-                400: "REQ_001",  # Malformed request
-                401: "AUTH_001",  # Invalid credentials
-                403: "AUTH_003",  # Insufficient permissions
-                404: "DATA_001",  # Resource not found
-                422: "DATA_002",  # Validation error
-                500: "SYS_001"   # Internal server error
-            }
+        request_id = request_id or str(uuid.uuid4())
+        timestamp = datetime.utcnow().isoformat()
 
-            error_code = error_code_map.get(e.status_code, f"REQ_{e.status_code}")
+        if isinstance(exc, HTTPException):
+            # Handle standard HTTP exceptions
+            self.logger.info(f"HTTP error {exc.status_code}: {exc.detail} (Request ID: {request_id})")
 
             error_response = {
-                "detail": e.detail,
-                "error_code": error_code,
+                "detail": exc.detail,
+                "error_code": ERROR_CODE_MAP.get(exc.status_code, f"REQ_{exc.status_code}"),
                 "timestamp": timestamp,
                 "request_id": request_id
             }
-            return JSONResponse(status_code=e.status_code, content=error_response)
+            return self._json(exc.status_code, error_response, request_id, exc.headers)
 
-        except Exception as e:
-            # Handle unexpected errors
-            request_id = str(uuid.uuid4())
-            timestamp = datetime.utcnow().isoformat()
+        # Handle unexpected errors
+        self.logger.error(f"Unexpected error: {exc}\nTraceback: {traceback.format_exc()}",
+                          extra={"request_id": request_id})
 
-            error_msg = str(e)
-            self.logger.error(f"Unexpected error: {error_msg}\nTraceback: {traceback.format_exc()}",
-                            extra={"request_id": request_id})
+        error_response = {
+            "detail": "An internal server error occurred",
+            "error_code": "SYS_001",
+            "timestamp": timestamp,
+            "request_id": request_id
+        }
+        return self._json(500, error_response, request_id)
 
-            error_response = {
-                "detail": "An internal server error occurred",
-                "error_code": "SYS_001",
-                "timestamp": timestamp,
-                "request_id": request_id
-            }
-            return JSONResponse(status_code=500, content=error_response)
+    @staticmethod
+    def _json(status_code: int, content: dict, request_id: str, headers: Optional[dict] = None) -> JSONResponse:
+        response_headers = dict(headers or {})
+        response_headers["X-Request-ID"] = request_id
+        return JSONResponse(status_code=status_code, content=content, headers=response_headers)
 
 
 def add_error_handling_middleware(app):
     """Helper function to add error handling middleware to the application"""
     app.add_middleware(ErrorHandlerMiddleware)
-    return app
\ No newline at end of file
+    return app
@@ -0,0 +1,65 @@
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict
+import time
+
+from src.utils.metrics import http_request_duration_seconds, http_requests_in_progress, http_requests_total
+
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Records request count, latency and in-flight requests per route template.
+
+    Requests are labelled with the route path (e.g. /api/{user_id}/tasks)
+    rather than the raw URL, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._endpoint_paths: Dict = {}
+
+    def route_template(self, scope: Scope) -> str:
+        """Route path for the request - from the endpoint the router resolved, if any"""
+        endpoint = scope.get("endpoint")
+        if endpoint is not None:
+            path = self._endpoint_paths.get(endpoint)
+            if path is not None:
+                return path
+
+        # Endpoint not cached yet, or the request failed before routing (e.g. auth)
+        application = scope.get("app")
+        for route in getattr(getattr(application, "router", None), "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                if endpoint is not None:
+                    self._endpoint_paths[endpoint] = route.path
+                return route.path
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+        http_requests_in_progress.inc(method)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = self.route_template(scope)
+            http_requests_in_progress.dec(method)
+            http_requests_total.inc(method, route, str(status_code))
+            http_request_duration_seconds.observe(elapsed, method, route)
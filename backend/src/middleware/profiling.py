@@ -0,0 +1,81 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import cProfile
+import random
+import time
+import uuid
+
+from src.utils.profiling import (
+    PROFILE_ID_HEADER, PROFILE_TOKEN_HEADER, PROFILE_TOP_N, ProfileStore, profile_record, profile_store,
+    profiler_lock, verify_profile_token
+)
+
+
+class ProfilingMiddleware:
+    """
+    Runs selected requests under cProfile and keeps the top functions by
+    cumulative time for retrieval through the admin profile endpoints.
+
+    A request is profiled when it carries a valid X-Profile-Token (signed
+    with PROFILING_SECRET) or is picked by PROFILING_SAMPLE_RATE. The profile
+    ID is returned in X-Profile-ID. cProfile sees everything running on the
+    event loop thread meanwhile, so concurrent requests show up in the
+    profile too; only one request is profiled at a time.
+    """
+
+    def __init__(self, app: ASGIApp, secret: str = "", sample_rate: float = 0.0,
+                 top_n: int = PROFILE_TOP_N, store: ProfileStore = profile_store):
+        self.app = app
+        self.secret = secret
+        self.sample_rate = sample_rate
+        self.top_n = top_n
+        self.store = store
+        self._token_header = PROFILE_TOKEN_HEADER.lower().encode("latin-1")
+
+    def trigger(self, scope: Scope):
+        """Why this request should be profiled, or None"""
+        if self.secret:
+            for name, value in scope["headers"]:
+                if name == self._token_header:
+                    if verify_profile_token(self.secret, value.decode("latin-1")):
+                        return "header"
+                    break
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = self.trigger(scope)
+        if trigger is None or not profiler_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+        finally:
+            profiler_lock.release()
+            duration = time.perf_counter() - start
+            self.store.add(profile_record(
+                profile_id, scope["method"], scope["path"], trigger, status_code,
+                duration, profiler, self.top_n
+            ))
@@ -0,0 +1,40 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.database.instrumentation import QueryStats, current_query_stats
+from src.utils.logging import LogLevel, log_event
+from src.utils.metrics import db_queries_per_request, db_time_per_request_seconds
+
+
+class QueryStatsMiddleware:
+    """
+    Collects SQL statistics for each HTTP request.
+
+    A fresh QueryStats is bound to current_query_stats for the duration of the
+    request, so the engine hooks can attribute statements to it, and is also
+    exposed to handlers as request.state.query_stats.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope["method"], scope["path"])
+        scope.setdefault("state", {})["query_stats"] = stats
+        token = current_query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_query_stats.reset(token)
+            if stats.count:
+                db_queries_per_request.observe(stats.count)
+                db_time_per_request_seconds.observe(stats.duration)
+                log_event(
+                    event_type="REQUEST_QUERIES",
+                    message=f"{stats.method} {stats.path} ran {stats.count} statements",
+                    level=LogLevel.DEBUG,
+                    **stats.as_dict()
+                )
@@ -0,0 +1,320 @@
+import math
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.logging import LogLevel, log_event, log_security_event
+from src.utils.metrics import rate_limit_store_errors_total, rate_limited_total
+from src.utils.token_bucket import TokenBucket
+
+
+RATE_LIMIT_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Idle buckets that have refilled completely are dropped this often (seconds)
+SWEEP_INTERVAL = 60.0
+# A failing shared store is reported at most this often (seconds)
+STORE_ERROR_LOG_INTERVAL = 60.0
+
+
+class RateLimit(NamedTuple):
+    """`limit` requests per `window` seconds: a bucket of `limit` tokens refilled over the window"""
+    limit: int
+    window: float
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.window
+
+    @property
+    def policy(self) -> str:
+        """RateLimit-Policy item, e.g. "10;w=60" """
+        return f"{self.limit};w={self.window:g}"
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """Parse "<count>/<period>", where period is second, minute, hour, day or a number of seconds"""
+        try:
+            count, period = spec.strip().split("/")
+            window = RATE_LIMIT_PERIODS.get(period.strip()) or float(period)
+            limit = cls(int(count), float(window))
+        except ValueError:
+            raise ValueError(f"invalid rate limit {spec!r}, expected e.g. '100/minute'") from None
+        if limit.limit <= 0 or limit.window <= 0:
+            raise ValueError(f"invalid rate limit {spec!r}, count and period must be positive")
+        return limit
+
+
+# A bucket to take a token from: (policy name, store key, limit)
+Bucket = Tuple[str, str, RateLimit]
+
+
+class MemoryRateLimitStore:
+    """
+    Token buckets in this process.
+
+    The buckets are only touched from the event loop and consume() never
+    awaits while it holds them, so it needs no lock. Each worker process has
+    its own buckets, so with several workers a client can get up to workers
+    times the limit; use RedisRateLimitStore where that matters.
+    """
+
+    def __init__(self, sweep_interval: float = SWEEP_INTERVAL):
+        self.sweep_interval = sweep_interval
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def consume(self, buckets: Sequence[Bucket]) -> Tuple[bool, List[float]]:
+        """
+        Take one token from every bucket, or from none if any is empty.
+        Returns whether the request is allowed and each bucket's tokens left.
+        """
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        found = []
+        for _, key, limit in buckets:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(limit.rate, limit.limit, now)
+            found.append(bucket)
+
+        levels = [bucket.available(now) for bucket in found]
+        if any(level < 1 for level in levels):
+            return False, levels
+        for bucket in found:
+            bucket.consume(now=now)
+        return True, [level - 1 for level in levels]
+
+    def _sweep(self, now: float):
+        # A full bucket is the same as a missing one, so forget it
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if bucket.available(now) < bucket.capacity
+        }
+        self._next_sweep = now + self.sweep_interval
+
+
+# Refills each bucket in KEYS from the Redis clock, then takes one token from
+# all of them or, if any is empty, from none. ARGV holds rate and capacity per
+# key. Replies the allowed flag and each bucket's tokens in thousandths, as
+# Lua numbers are truncated to integers in replies.
+TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local levels = {}
+local allowed = 1
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local capacity = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local elapsed = math.max(0, now - (tonumber(state[2]) or now))
+    levels[i] = math.min(capacity, tokens + elapsed * rate)
+    if levels[i] < 1 then
+        allowed = 0
+    end
+end
+local reply = {allowed}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local capacity = tonumber(ARGV[2 * i])
+    local tokens = levels[i] - allowed
+    redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+    -- Expire once full again; a missing key reads as a full bucket
+    redis.call('PEXPIRE', key, math.ceil((capacity - tokens) / rate * 1000) + 1000)
+    reply[i + 1] = math.floor(tokens * 1000)
+end
+return reply
+"""
+
+
+class RedisRateLimitStore:
+    """
+    Token buckets in Redis, shared by every worker and instance. Each
+    request is one script call that updates all of its buckets atomically
+    (Redis 5 or later). Needs the optional redis package.
+
+    While Redis is unreachable the buckets fall back to a per-process
+    MemoryRateLimitStore rather than failing requests or dropping limits.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_STORE_URL needs the redis package: pip install redis") from e
+
+        self.prefix = prefix
+        self.client = Redis.from_url(url)
+        self.script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+        self.fallback = MemoryRateLimitStore()
+        self._error_logged_at: Optional[float] = None
+
+    async def consume(self, buckets: Sequence[Bucket]) -> Tuple[bool, List[float]]:
+        keys = [self.prefix + key for _, key, _ in buckets]
+        args = [value for _, _, limit in buckets for value in (limit.rate, limit.limit)]
+        try:
+            reply = await self.script(keys=keys, args=args)
+        except Exception as e:
+            self._store_failed(e)
+            return await self.fallback.consume(buckets)
+        return bool(reply[0]), [level / 1000 for level in reply[1:]]
+
+    def _store_failed(self, exc: Exception):
+        rate_limit_store_errors_total.inc()
+        now = time.monotonic()
+        if self._error_logged_at is None or now - self._error_logged_at >= STORE_ERROR_LOG_INTERVAL:
+            self._error_logged_at = now
+            log_event(
+                event_type="RATE_LIMIT_STORE_ERROR",
+                message=f"Rate limit store unavailable, using per-process buckets: {exc}",
+                level=LogLevel.WARNING
+            )
+
+
+def client_ip(scope: Scope) -> str:
+    """
+    Client address. Behind a proxy listed in FORWARDED_ALLOW_IPS, uvicorn has
+    already replaced the proxy's address with the one from X-Forwarded-For.
+    """
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def is_rate_limited(scope: Scope) -> bool:
+    return scope["type"] == "http" and scope["path"].startswith("/api/") and scope["method"] != "OPTIONS"
+
+
+def rate_limit_headers(taken: Sequence[Tuple[Bucket, float]]) -> Dict[str, str]:
+    """RateLimit-* headers for the bucket closest to empty, with every bucket's policy"""
+    (_, _, limit), tokens = min(taken, key=lambda entry: entry[1])
+    tokens = max(tokens, 0.0)
+    return {
+        "RateLimit-Limit": str(limit.limit),
+        "RateLimit-Remaining": str(int(tokens)),
+        "RateLimit-Reset": str(math.ceil((limit.limit - tokens) / limit.rate)),
+        "RateLimit-Policy": ", ".join(bucket_limit.policy for (_, _, bucket_limit), _ in taken),
+    }
+
+
+async def take_tokens(store, buckets: List[Bucket], scope: Scope):
+    """
+    Take a token from each bucket, remembering the levels for the response
+    headers; raises 429 when any of them is empty.
+    """
+    allowed, levels = await store.consume(buckets)
+    taken = list(zip(buckets, levels))
+    if allowed:
+        scope.setdefault("state", {}).setdefault("rate_limits", []).extend(taken)
+        return
+
+    # The lowest of these buckets is one that ran out
+    (name, _, limit), tokens = min(taken, key=lambda entry: entry[1])
+    rate_limited_total.inc(name)
+    user_id = scope.get("state", {}).get("user_id")
+    log_security_event(
+        "RATE_LIMITED",
+        f"Rate limit exceeded: {name} {limit.limit} per {limit.window:g}s",
+        user_id=str(user_id) if user_id is not None else None,
+        ip=client_ip(scope),
+        policy=name,
+        path=scope["path"]
+    )
+    headers = rate_limit_headers(taken)
+    headers["Retry-After"] = str(math.ceil((1 - max(tokens, 0.0)) / limit.rate))
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Rate limit exceeded, retry later",
+        headers=headers
+    )
+
+
+class RateLimitMiddleware:
+    """
+    Token-bucket rate limits per client address on /api requests.
+
+    Every request takes a token from its address's bucket, and login and
+    register also from a per-address route bucket with a much smaller
+    budget against credential stuffing and signup spam. This runs outside
+    AuthMiddleware, so requests with bad or missing tokens are counted and
+    limited too; UserRateLimitMiddleware adds the per-user bucket inside it.
+    Over the limit a request is rejected with 429 and Retry-After, raised to
+    the surrounding ErrorHandlerMiddleware. Responses carry the RateLimit-*
+    headers of the tightest bucket either middleware took from.
+    """
+
+    def __init__(self, app: ASGIApp, ip_limit: RateLimit,
+                 route_limits: Optional[Dict[str, Tuple[str, RateLimit]]] = None, store=None):
+        self.app = app
+        self.ip_limit = ip_limit
+        # path -> (policy name, limit); paths sharing a name share a bucket
+        self.route_limits = route_limits or {}
+        self.store = store or MemoryRateLimitStore()
+
+    def buckets(self, scope: Scope) -> List[Bucket]:
+        ip = client_ip(scope)
+        buckets = [("ip", f"ip:{ip}", self.ip_limit)]
+
+        route = self.route_limits.get(scope["path"])
+        if route is not None:
+            name, limit = route
+            buckets.append((name, f"{name}:{ip}", limit))
+        return buckets
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not is_rate_limited(scope):
+            await self.app(scope, receive, send)
+            return
+
+        await take_tokens(self.store, self.buckets(scope), scope)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Includes the user's bucket when UserRateLimitMiddleware took from it
+                response_headers = MutableHeaders(scope=message)
+                for header, value in rate_limit_headers(scope["state"]["rate_limits"]).items():
+                    response_headers.append(header, value)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class UserRateLimitMiddleware:
+    """
+    The per-user token bucket, inside AuthMiddleware so the user is known.
+    Its level is reported in the headers RateLimitMiddleware adds.
+    """
+
+    def __init__(self, app: ASGIApp, user_limit: RateLimit, store=None):
+        self.app = app
+        self.user_limit = user_limit
+        self.store = store or MemoryRateLimitStore()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        user_id = scope.get("state", {}).get("user_id") if is_rate_limited(scope) else None
+        if user_id is not None:
+            await take_tokens(self.store, [("user", f"user:{user_id}", self.user_limit)], scope)
+        await self.app(scope, receive, send)
+
+
+def create_rate_limit_store(settings):
+    """Redis-backed buckets when RATE_LIMIT_STORE_URL is set, otherwise per process"""
+    store_url = settings.rate_limit_store_url
+    return RedisRateLimitStore(store_url) if store_url else MemoryRateLimitStore()
+
+
+def auth_route_limits(settings) -> Dict[str, Tuple[str, RateLimit]]:
+    """Login and register budgets by path, under both API prefixes"""
+    login = RateLimit.parse(settings.rate_limit_login)
+    register = RateLimit.parse(settings.rate_limit_register)
+    route_limits = {}
+    for prefix in ("/api/v1", "/api/auth"):
+        route_limits[f"{prefix}/login"] = ("login", login)
+        route_limits[f"{prefix}/register"] = ("register", register)
+    return route_limits
@@ -0,0 +1,64 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import time
+
+from src.utils.server_timing import ServerTimings, current_timings
+
+
+# Phases in the order they appear in the header
+TIMING_PHASES = ("auth", "db", "hash", "serialize")
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header breaking the request down into auth, db,
+    hash and serialize time, plus `app` - everything up to the response start.
+
+    db is the SQL time collected by QueryStatsMiddleware, so it requires SQL
+    instrumentation; the other phases are recorded with utils.server_timing.
+    Only installed when SERVER_TIMING is enabled.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = ServerTimings()
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - start
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", self.header_value(scope, timings, elapsed))
+            await send(message)
+
+        token = current_timings.set(timings)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_timings.reset(token)
+
+    @staticmethod
+    def header_value(scope: Scope, timings: ServerTimings, elapsed: float) -> str:
+        durations = dict(timings.durations)
+        description = {}
+
+        query_stats = scope.get("state", {}).get("query_stats")
+        if query_stats is not None and query_stats.count:
+            durations["db"] = query_stats.duration
+            description["db"] = f"{query_stats.count} queries"
+
+        metrics = []
+        for name in TIMING_PHASES:
+            if name in durations:
+                metric = f"{name};dur={durations[name] * 1000:.2f}"
+                if name in description:
+                    metric += f';desc="{description[name]}"'
+                metrics.append(metric)
+        metrics.append(f"app;dur={elapsed * 1000:.2f}")
+        return ", ".join(metrics)
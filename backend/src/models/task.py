@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime
 from typing import Optional
@@ -15,8 +16,12 @@ class Task(TaskBase, table=True):
     Task model representing a personal task owned by a single user.
     Contains title, description, completion status, and timestamps.
     """
+    # Serves both the user_id filter and the list order, so listing a user's
+    # tasks never sorts; it also covers plain user_id lookups
+    __table_args__ = (Index("ix_task_user_id_created_at_id", "user_id", "created_at", "id"),)
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    user_id: uuid.UUID = Field(foreign_key="user.id", index=True)
+    user_id: uuid.UUID = Field(foreign_key="user.id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, validator
-from typing import Optional
+from pydantic import BaseModel, Field, validator
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -64,7 +64,7 @@ class TaskRead(TaskBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 
 class TaskToggleComplete(BaseModel):
@@ -109,6 +109,48 @@ class TaskListResponse(BaseModel):
         }
 
 
+MAX_BATCH_OPERATIONS = 100
+
+
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "toggle", "delete"]
+    task_id: Optional[UUID] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+    atomic: bool = True
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "atomic": True,
+                "operations": [
+                    {"op": "create", "data": {"title": "Buy groceries"}},
+                    {"op": "toggle", "task_id": "123e4567-e89b-12d3-a456-426614174000"},
+                    {"op": "update", "task_id": "123e4567-e89b-12d3-a456-426614174000",
+                     "data": {"title": "Buy groceries and fruit"}},
+                    {"op": "delete", "task_id": "123e4567-e89b-12d3-a456-426614174001"}
+                ]
+            }
+        }
+
+
+class BatchOperationResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    task: Optional[TaskRead] = None
+    detail: Optional[str] = None
+    error_code: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    results: List[BatchOperationResult]
+    committed: bool
+
+
 class ErrorResponse(BaseModel):
     detail: str
     error_code: str
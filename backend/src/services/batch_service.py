@@ -0,0 +1,115 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+import logging
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.exceptions import AuthException, ValidationErrorException
+from src.middleware.error_handler import ERROR_CODE_MAP
+from src.models.task import Task
+from src.schemas.task import BatchOperation, TaskCreate, TaskUpdate
+from src.services.import_service import format_validation_error
+from src.services.task_service import TaskService
+from src.utils.serialization import task_to_dict
+
+
+logger = logging.getLogger(__name__)
+
+
+class TaskBatchService:
+    """
+    Runs an ordered list of task operations for one user in a single session.
+
+    Operations go through TaskService with autocommit off, so the whole batch
+    is committed once at the end. In atomic mode the first failure rolls back
+    everything, the remaining operations are skipped and every operation but
+    the failed one is reported as 424 Failed Dependency; otherwise each
+    operation runs in its own savepoint and failures only undo that operation.
+    """
+
+    def __init__(self, db_session: AsyncSession, user_id: UUID):
+        self.db_session = db_session
+        self.user_id = user_id
+        self.task_service = TaskService(db_session, autocommit=False)
+
+    async def apply(self, operation: BatchOperation) -> Tuple[int, Optional[Task]]:
+        """Apply one operation and return its status code and resulting task"""
+        data = dict(operation.data or {})
+
+        if operation.op == "create":
+            data.setdefault("user_id", self.user_id)
+            task = await self.task_service.create_task(TaskCreate(**data), self.user_id)
+            return status.HTTP_201_CREATED, task
+
+        if operation.task_id is None:
+            raise ValidationErrorException(detail=f"task_id is required for {operation.op}")
+
+        if operation.op == "update":
+            task = await self.task_service.update_task(operation.task_id, TaskUpdate(**data), self.user_id)
+            return status.HTTP_200_OK, task
+
+        if operation.op == "toggle":
+            task = await self.task_service.toggle_task_completion(operation.task_id, self.user_id)
+            return status.HTTP_200_OK, task
+
+        await self.task_service.delete_task(operation.task_id, self.user_id)
+        return status.HTTP_204_NO_CONTENT, None
+
+    @staticmethod
+    def error_result(index: int, operation: BatchOperation, exc: Exception) -> dict:
+        """Describe a failed operation using the standard error codes"""
+        if isinstance(exc, AuthException):
+            status_code, error_code, detail = exc.status_code, exc.error_code, exc.detail
+        elif isinstance(exc, HTTPException):
+            status_code = exc.status_code
+            error_code = ERROR_CODE_MAP.get(exc.status_code, f"REQ_{exc.status_code}")
+            detail = exc.detail
+        elif isinstance(exc, ValidationError):
+            status_code, error_code, detail = 422, "DATA_002", format_validation_error(exc)
+        else:
+            logger.exception("Batch operation %s (%s) failed", index, operation.op)
+            status_code, error_code, detail = 500, "SYS_001", "An internal server error occurred"
+
+        return {"index": index, "op": operation.op, "status": status_code,
+                "task": None, "detail": detail, "error_code": error_code}
+
+    async def execute(self, operations: List[BatchOperation], atomic: bool = True) -> dict:
+        """Run the operations in order and commit once; returns per-operation results"""
+        results = []
+        failed = False
+
+        for index, operation in enumerate(operations):
+            if failed and atomic:
+                results.append({"index": index, "op": operation.op, "status": status.HTTP_424_FAILED_DEPENDENCY,
+                                "task": None, "detail": "Not executed: batch aborted", "error_code": None})
+                continue
+
+            try:
+                if atomic:
+                    status_code, task = await self.apply(operation)
+                else:
+                    async with self.db_session.begin_nested():
+                        status_code, task = await self.apply(operation)
+            except Exception as e:
+                results.append(self.error_result(index, operation, e))
+                failed = True
+                continue
+
+            # Serialize now - attributes are expired once the batch commits
+            results.append({"index": index, "op": operation.op, "status": status_code,
+                            "task": task_to_dict(task) if task is not None else None,
+                            "detail": None, "error_code": None})
+
+        if failed and atomic:
+            await self.db_session.rollback()
+            # Operations that succeeded before the failure were rolled back with it
+            for result in results:
+                if result["status"] < status.HTTP_400_BAD_REQUEST:
+                    result.update(status=status.HTTP_424_FAILED_DEPENDENCY, task=None,
+                                  detail="Not applied: batch rolled back")
+            return {"results": results, "committed": False}
+
+        await self.db_session.commit()
+        return {"results": results, "committed": True}
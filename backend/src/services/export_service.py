@@ -0,0 +1,94 @@
+from typing import AsyncIterator, Iterable, Sequence
+from uuid import UUID
+import csv
+import io
+import zlib
+
+from src.database.engine import AsyncSessionLocal
+from src.services.task_service import TaskService
+from src.utils.serialization import TASK_FIELDS, dumps, task_to_dict
+
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class TaskExporter:
+    """
+    Streams a user's tasks as NDJSON or CSV.
+
+    Rows are read from a server-side cursor in batches and encoded one batch
+    at a time, so memory use does not depend on the number of tasks. The
+    export opens its own database session because it outlives the request
+    handler that starts it.
+    """
+
+    def __init__(self, user_id: UUID, export_format: str = "ndjson",
+                 compress: bool = False, batch_size: int = EXPORT_BATCH_SIZE):
+        if export_format not in EXPORT_MEDIA_TYPES:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        self.user_id = user_id
+        self.export_format = export_format
+        self.compress = compress
+        self.batch_size = batch_size
+
+    @property
+    def media_type(self) -> str:
+        return EXPORT_MEDIA_TYPES[self.export_format]
+
+    @property
+    def filename(self) -> str:
+        return f"tasks.{self.export_format}"
+
+    def encode_ndjson(self, rows: Sequence) -> bytes:
+        return b"".join(dumps(task_to_dict(row)) + b"\n" for row in rows)
+
+    def encode_csv(self, rows: Iterable, header: bool = False) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if header:
+            writer.writerow(TASK_FIELDS)
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        return buffer.getvalue().encode("utf-8")
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Encoded, uncompressed chunks - one per database batch"""
+        if self.export_format == "csv":
+            yield self.encode_csv((), header=True)
+
+        async with AsyncSessionLocal() as session:
+            task_service = TaskService(session)
+            async for rows in task_service.stream_user_tasks(self.user_id, self.batch_size):
+                if self.export_format == "csv":
+                    yield self.encode_csv(rows)
+                else:
+                    yield self.encode_ndjson(rows)
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Response body chunks, gzip-compressed on the fly when requested"""
+        if not self.compress:
+            async for chunk in self.iter_chunks():
+                yield chunk
+            return
+
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+        async for chunk in self.iter_chunks():
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
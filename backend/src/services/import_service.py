@@ -0,0 +1,195 @@
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import UUID
+import codecs
+import csv
+import json
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.task import Task
+from src.schemas.task import TaskCreate
+
+
+IMPORT_FORMATS = ("ndjson", "csv")
+IMPORT_BATCH_SIZE = 500
+# Upper bound on error entries kept in a report, so a bad file can't grow it without limit
+MAX_REPORTED_ERRORS = 1000
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a stream of UTF-8 byte chunks into lines without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_file_chunks(path: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Read a local file in chunks, for the command line importer"""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+class ImportReport:
+    """Outcome of an import: counts plus the error for every rejected line"""
+
+    def __init__(self):
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def add_error(self, line: int, error: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def to_dict(self) -> dict:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors)
+        }
+
+
+def format_validation_error(e: ValidationError) -> str:
+    """Flatten a pydantic ValidationError into a one-line message"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" if err["loc"] else err["msg"]
+        for err in e.errors()
+    )
+
+
+class TaskImporter:
+    """
+    Imports tasks for a single user from NDJSON or CSV.
+
+    Input is consumed line by line and every record is validated with the
+    TaskCreate rules. Valid records are inserted in batches, each batch in its
+    own transaction, so a bad line or a failed batch never rolls back the rest
+    of the import. The next chunk of input is only read once the current batch
+    has been written, which gives natural backpressure on the request body.
+    """
+
+    def __init__(self, db_session: AsyncSession, user_id: UUID,
+                 import_format: str = "ndjson", batch_size: int = IMPORT_BATCH_SIZE):
+        if import_format not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported import format: {import_format}")
+
+        self.db_session = db_session
+        self.user_id = user_id
+        self.import_format = import_format
+        self.batch_size = batch_size
+        self.report = ImportReport()
+
+    def parse_record(self, record: dict) -> dict:
+        """Validate one record and return the column values to insert"""
+        if record.get("user_id") in (None, ""):
+            record["user_id"] = self.user_id
+        if record.get("description") == "":
+            record["description"] = None
+
+        task_create = TaskCreate(**record)
+        if task_create.user_id != self.user_id:
+            raise ValueError("Cannot create task for another user")
+
+        return {
+            "title": task_create.title,
+            "description": task_create.description,
+            "completed": task_create.completed,
+            "user_id": self.user_id
+        }
+
+    async def iter_records(self, lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+        """Yield (line number, record, parse error) for every non-blank input record"""
+        if self.import_format == "ndjson":
+            line_number = 0
+            async for line in lines:
+                line_number += 1
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_number, None, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, None, "Record must be a JSON object"
+                    continue
+                yield line_number, record, None
+            return
+
+        header = None
+        pending = ""
+        line_number = 0
+        record_line = 0
+        async for line in lines:
+            line_number += 1
+            if not pending:
+                record_line = line_number
+            pending = f"{pending}\n{line}" if pending else line
+            # A quoted field may span several lines; wait until the quotes balance
+            if pending.count('"') % 2:
+                continue
+            record_text, pending = pending, ""
+            if not record_text.strip():
+                continue
+            row = next(csv.reader([record_text]))
+            if header is None:
+                header = [column.strip() for column in row]
+                continue
+            if len(row) != len(header):
+                yield record_line, None, f"Expected {len(header)} columns, got {len(row)}"
+                continue
+            yield record_line, dict(zip(header, row)), None
+
+        if pending:
+            yield record_line, None, "Unterminated quoted field"
+
+    async def flush(self, batch: List[Tuple[int, dict]]):
+        """Insert one batch in its own transaction"""
+        if not batch:
+            return
+        try:
+            await self.db_session.execute(insert(Task), [values for _, values in batch])
+            await self.db_session.commit()
+            self.report.imported += len(batch)
+        except Exception as e:
+            await self.db_session.rollback()
+            for line_number, _ in batch:
+                self.report.add_error(line_number, f"Batch insert failed: {e.__class__.__name__}")
+
+    async def run(self, chunks: AsyncIterator[bytes]) -> ImportReport:
+        """Import everything from a stream of byte chunks"""
+        batch: List[Tuple[int, dict]] = []
+
+        async for line_number, record, error in self.iter_records(iter_lines(chunks)):
+            if error is None:
+                try:
+                    batch.append((line_number, self.parse_record(record)))
+                except ValidationError as e:
+                    error = format_validation_error(e)
+                except (TypeError, ValueError) as e:
+                    error = str(e)
+            if error is not None:
+                self.report.add_error(line_number, error)
+                continue
+
+            if len(batch) >= self.batch_size:
+                await self.flush(batch)
+                batch = []
+
+        await self.flush(batch)
+        return self.report
@@ -0,0 +1,138 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.database.engine import engine, probe_engine
+from src.services.user_service import password_hasher
+from src.utils.logging import LogLevel, log_event
+
+
+READINESS_PROBE_INTERVAL = 5.0  # seconds
+READINESS_DB_TIMEOUT = 2.0  # seconds
+# Results older than this many intervals mean the probe loop has stalled
+READINESS_MAX_AGE_INTERVALS = 3
+
+
+class ReadinessProbe:
+    """
+    Dependency checks for /readyz, run by a background task on an interval.
+
+    Load balancer probes only read the cached result, so however often they
+    poll, the database sees one ping per interval. The ping uses its own
+    unpooled engine, so a saturated request pool shows up in the db_pool
+    check instead of timing out the database check.
+    """
+
+    def __init__(self, interval: float = READINESS_PROBE_INTERVAL,
+                 db_timeout: float = READINESS_DB_TIMEOUT, db_engine: AsyncEngine = probe_engine):
+        self.interval = interval
+        self.db_timeout = db_timeout
+        self.db_engine = db_engine
+        self._result: Optional[dict] = None
+        self._checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def check_database(self) -> dict:
+        """Ping the database and read the Alembic migration version, if any"""
+        def read_migration_version(connection) -> Optional[str]:
+            if not inspect(connection).has_table("alembic_version"):
+                return None
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+        async def ping() -> dict:
+            start = time.perf_counter()
+            async with self.db_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                latency = time.perf_counter() - start
+                migration_version = await conn.run_sync(read_migration_version)
+            return {"ok": True, "latency_ms": round(latency * 1000, 3), "migration_version": migration_version}
+
+        try:
+            return await asyncio.wait_for(ping(), self.db_timeout)
+        except asyncio.TimeoutError:
+            return {"ok": False, "error": f"timed out after {self.db_timeout}s"}
+        except Exception as e:
+            return {"ok": False, "error": type(e).__name__}
+
+    @staticmethod
+    def check_pool() -> dict:
+        """Connections in use relative to what the pool can hand out"""
+        pool = engine.pool
+        size = getattr(pool, "size", None)
+        checked_out = getattr(pool, "checkedout", None)
+        if size is None or checked_out is None:
+            return {"ok": True}
+
+        in_use = checked_out()
+        max_overflow = getattr(pool, "_max_overflow", 0)
+        result = {"ok": True, "checked_out": in_use, "size": size(), "max_overflow": max_overflow}
+        # A negative max_overflow means the pool can grow without limit
+        if max_overflow >= 0:
+            result["saturation"] = round(in_use / (size() + max_overflow), 3)
+        return result
+
+    @staticmethod
+    def check_password_hasher() -> dict:
+        """Hash operations waiting for a free executor thread"""
+        in_flight = password_hasher.in_flight
+        return {
+            "ok": True,
+            "workers": password_hasher.max_workers,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - password_hasher.max_workers),
+        }
+
+    async def refresh(self) -> dict:
+        database = await self.check_database()
+        self._result = {
+            "checked_at": datetime.utcnow().isoformat(),
+            "checks": {
+                "database": database,
+                "db_pool": self.check_pool(),
+                "password_hasher": self.check_password_hasher(),
+            },
+        }
+        self._checked_at = time.monotonic()
+        return self._result
+
+    def status(self) -> dict:
+        """Latest probe result with an overall ready flag; never touches the database"""
+        if self._result is None:
+            return {"ready": False, "reason": "starting"}
+
+        age = time.monotonic() - self._checked_at
+        ready = all(check["ok"] for check in self._result["checks"].values())
+        status = {"ready": ready, "age_seconds": round(age, 3), **self._result}
+        if age > self.interval * READINESS_MAX_AGE_INTERVALS:
+            status["ready"] = False
+            status["reason"] = "stale"
+        return status
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                log_event(
+                    event_type="READINESS_PROBE_ERROR",
+                    message=f"Readiness probe failed: {type(e).__name__}",
+                    level=LogLevel.ERROR
+                )
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
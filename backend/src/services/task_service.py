@@ -1,5 +1,6 @@
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence
 from sqlmodel import select, Session, func
+from sqlalchemy import bindparam, text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -11,11 +12,96 @@ from src.models.user import User
 from src.auth.exceptions import ResourceNotFoundException, InsufficientPermissionsException
 
 
+def _sqlite_uuid(column: str) -> str:
+    # Uuid columns are stored as 32 hex characters on SQLite
+    return (f"substr({column}, 1, 8) || '-' || substr({column}, 9, 4) || '-' || "
+            f"substr({column}, 13, 4) || '-' || substr({column}, 17, 4) || '-' || substr({column}, 21)")
+
+
+def _sqlite_datetime(column: str) -> str:
+    # Stored as 'YYYY-MM-DD HH:MM:SS.ffffff', isoformat() drops zero microseconds
+    return (f"replace(CASE WHEN substr({column}, 20) = '.000000' THEN substr({column}, 1, 19) "
+            f"ELSE {column} END, ' ', 'T')")
+
+
+def _postgres_datetime(column: str) -> str:
+    return (f"to_char({column}, 'YYYY-MM-DD\"T\"HH24:MI:SS') || "
+            f"CASE WHEN date_part('microseconds', {column})::bigint % 1000000 = 0 THEN '' "
+            f"ELSE to_char({column}, '.US') END")
+
+
+# Same rows, in the same order, as get_user_tasks
+_USER_TASKS_PAGE = ("SELECT * FROM task WHERE task.user_id = :user_id "
+                    "ORDER BY task.created_at, task.id LIMIT :limit OFFSET :skip")
+_USER_TASK_COUNT = "SELECT count(task.id) FROM task WHERE task.user_id = :user_id"
+
+# SQLite's JSON functions emit compact JSON in key insertion order, which
+# matches the TaskListResponse serialization byte for byte
+_SQLITE_TASK_LIST_JSON = f"""
+SELECT json_object(
+    'tasks', json((
+        SELECT json_group_array(json_object(
+            'title', t.title,
+            'description', t.description,
+            'completed', json(CASE WHEN t.completed THEN 'true' ELSE 'false' END),
+            'id', {_sqlite_uuid("t.id")},
+            'user_id', {_sqlite_uuid("t.user_id")},
+            'created_at', {_sqlite_datetime("t.created_at")},
+            'updated_at', {_sqlite_datetime("t.updated_at")}
+        ))
+        FROM ({_USER_TASKS_PAGE}) AS t
+    )),
+    'total_count', ({_USER_TASK_COUNT})
+)
+"""
+
+# json_build_object/json_agg pad their output with spaces and newlines, so
+# the document is concatenated by hand with to_json() doing the escaping
+_POSTGRES_TASK_LIST_JSON = f"""
+SELECT '{{"tasks":[' || coalesce(string_agg(
+    '{{"title":' || to_json(t.title)::text
+    || ',"description":' || coalesce(to_json(t.description)::text, 'null')
+    || ',"completed":' || CASE WHEN t.completed THEN 'true' ELSE 'false' END
+    || ',"id":"' || t.id::text
+    || '","user_id":"' || t.user_id::text
+    || '","created_at":"' || {_postgres_datetime("t.created_at")}
+    || '","updated_at":"' || {_postgres_datetime("t.updated_at")}
+    || '"}}', ',' ORDER BY t.created_at, t.id), '')
+    || '],"total_count":' || ({_USER_TASK_COUNT})::text || '}}'
+FROM ({_USER_TASKS_PAGE}) AS t
+"""
+
+TASK_LIST_JSON_STATEMENTS = {
+    dialect: text(sql).bindparams(bindparam("user_id", type_=Task.__table__.c.user_id.type))
+    for dialect, sql in (("sqlite", _SQLITE_TASK_LIST_JSON), ("postgresql", _POSTGRES_TASK_LIST_JSON))
+}
+
+
 class TaskService:
     """Service class for handling task-related business logic with user-based filtering"""
 
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, autocommit: bool = True):
         self.db_session = db_session
+        # With autocommit off, writes are only flushed and the caller owns the
+        # transaction (used to run several operations under one commit)
+        self.autocommit = autocommit
+
+    async def _save(self, task: Optional[Task] = None):
+        """Commit (or just flush) pending changes and reload the task if given"""
+        if not self.autocommit:
+            await self.db_session.flush()
+            return
+
+        await self.db_session.commit()
+        if task is not None:
+            await self.db_session.refresh(task)
+
+    @staticmethod
+    def _select_task(fields: Optional[Sequence[str]] = None):
+        """Select whole Task entities, or only the named columns"""
+        if fields is None:
+            return select(Task)
+        return select(*(getattr(Task, field) for field in fields))
 
     async def create_task(self, task_create: TaskCreate, current_user_id: UUID) -> Task:
         """
@@ -38,35 +124,40 @@ class TaskService:
 
         # Add to database
         self.db_session.add(task)
-        await self.db_session.commit()
-        await self.db_session.refresh(task)
+        await self._save(task)
 
         return task
 
-    async def get_user_tasks(self, current_user_id: UUID, skip: int = 0, limit: int = 100) -> List[Task]:
+    async def get_user_tasks(self, current_user_id: UUID, skip: int = 0, limit: int = 100,
+                             fields: Optional[Sequence[str]] = None) -> List[Task]:
         """
-        Retrieve all tasks for the current user.
+        Retrieve all tasks for the current user, oldest first.
         This enforces user-based data filtering.
+        When fields are given only those columns are selected and plain rows
+        are returned instead of Task instances.
         """
         statement = (
-            select(Task)
+            self._select_task(fields)
             .where(Task.user_id == current_user_id)
+            .order_by(Task.created_at, Task.id)
             .offset(skip)
             .limit(limit)
         )
 
         result = await self.db_session.execute(statement)
-        tasks = result.scalars().all()
+        tasks = result.scalars().all() if fields is None else result.all()
         return tasks
 
-    async def get_task_by_id(self, task_id: UUID, current_user_id: UUID) -> Task:
+    async def get_task_by_id(self, task_id: UUID, current_user_id: UUID,
+                             fields: Optional[Sequence[str]] = None) -> Task:
         """
         Retrieve a specific task by ID for the current user.
         Validates that the task belongs to the current user.
+        When fields are given only those columns are selected.
         """
-        statement = select(Task).where(Task.id == task_id, Task.user_id == current_user_id)
+        statement = self._select_task(fields).where(Task.id == task_id, Task.user_id == current_user_id)
         result = await self.db_session.execute(statement)
-        task = result.scalar_one_or_none()
+        task = result.scalar_one_or_none() if fields is None else result.one_or_none()
 
         if not task:
             raise ResourceNotFoundException(detail="Task not found or does not belong to user")
@@ -91,8 +182,7 @@ class TaskService:
         for field, value in update_data.items():
             setattr(task, field, value)
 
-        await self.db_session.commit()
-        await self.db_session.refresh(task)
+        await self._save(task)
 
         return task
 
@@ -111,7 +201,7 @@ class TaskService:
 
         # Delete the task
         await self.db_session.delete(task)
-        await self.db_session.commit()
+        await self._save()
 
         return True
 
@@ -131,8 +221,7 @@ class TaskService:
         # Toggle the completion status
         task.completed = not task.completed
 
-        await self.db_session.commit()
-        await self.db_session.refresh(task)
+        await self._save(task)
 
         return task
 
@@ -143,4 +232,46 @@ class TaskService:
         statement = select(func.count(Task.id)).where(Task.user_id == current_user_id)
         result = await self.db_session.execute(statement)
         count = result.scalar_one()
-        return count
\ No newline at end of file
+        return count
+
+    async def stream_user_tasks(self, current_user_id: UUID, batch_size: int = 1000) -> AsyncIterator[Sequence]:
+        """
+        Stream all tasks for the current user in batches using a server-side cursor.
+        Yields lists of rows with the TaskRead columns; plain rows are not kept
+        in the session identity map, so memory stays flat however many tasks
+        the user has.
+        """
+        statement = (
+            select(Task.title, Task.description, Task.completed, Task.id,
+                   Task.user_id, Task.created_at, Task.updated_at)
+            .where(Task.user_id == current_user_id)
+            .order_by(Task.created_at, Task.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        result = await self.db_session.stream(statement)
+        try:
+            async for partition in result.partitions():
+                yield partition
+        finally:
+            await result.close()
+
+    def supports_json_aggregation(self) -> bool:
+        """Whether get_user_tasks_json can run on the session's database"""
+        return self.db_session.get_bind().dialect.name in TASK_LIST_JSON_STATEMENTS
+
+    async def get_user_tasks_json(self, current_user_id: UUID, skip: int = 0, limit: int = 100) -> bytes:
+        """
+        Retrieve the TaskListResponse body for the current user, built by the database.
+        Skips ORM hydration and Python serialization entirely; the output is
+        identical to serializing get_user_tasks and get_user_task_count.
+        """
+        dialect = self.db_session.get_bind().dialect.name
+        statement = TASK_LIST_JSON_STATEMENTS.get(dialect)
+        if statement is None:
+            raise NotImplementedError(f"JSON aggregation is not supported on {dialect}")
+
+        result = await self.db_session.execute(
+            statement, {"user_id": current_user_id, "skip": skip, "limit": limit}
+        )
+        return result.scalar_one().encode("utf-8")
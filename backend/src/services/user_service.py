@@ -3,13 +3,13 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
-from passlib.context import CryptContext
 
+from src.auth.password_hasher import PasswordHasher
 from src.models.user import User, UserCreate as UserCreateModel
 from src.schemas.user import UserCreate
 
-# Password hashing context - using pbkdf2 instead of bcrypt to avoid byte length issues
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# Hashing runs off the event loop on a small thread pool; passlib loads on first use
+password_hasher = PasswordHasher()
 
 
 class UserService:
@@ -36,7 +36,7 @@ class UserService:
         if len(password.encode('utf-8')) > 72:
             password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
 
-        if not user or not pwd_context.verify(password, user.hashed_password):
+        if not user or not await password_hasher.verify(password, user.hashed_password):
             return None
         return user
 
@@ -50,13 +50,13 @@ class UserService:
 
             # Hash the password with proper error handling
             try:
-                hashed_password = pwd_context.hash(password)
+                hashed_password = await password_hasher.hash(password)
             except ValueError as ve:
                 # Handle bcrypt password length error
                 if "password cannot be longer than 72 bytes" in str(ve):
                     # Ensure it's definitely under 72 bytes
                     password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-                    hashed_password = pwd_context.hash(password)
+                    hashed_password = await password_hasher.hash(password)
                 else:
                     raise ve
 
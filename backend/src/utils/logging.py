@@ -1,9 +1,19 @@
 import logging
-from typing import Optional
+import logging.handlers
+import queue
+import threading
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional
 from datetime import datetime
+import atexit
 import json
+import os
+import random
+import time
 from enum import Enum
 
+from src.utils.token_bucket import TokenBucket
+
 class LogLevel(Enum):
     DEBUG = "DEBUG"
     INFO = "INFO"
@@ -11,14 +21,182 @@ class LogLevel(Enum):
     ERROR = "ERROR"
     CRITICAL = "CRITICAL"
 
-def setup_logging(log_level: str = "INFO"):
-    """Setup logging configuration"""
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Defaults for the background logging pipeline
+LOG_QUEUE_SIZE = 10000
+LOG_BATCH_SIZE = 256
+LOG_FLUSH_INTERVAL = 0.5  # seconds
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
+_STOP = object()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the caller.
+
+    Records are handed to the background writer unformatted; when the bounded
+    queue is full the record is dropped and counted instead of waiting.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting (including json.dumps of structured events) happens on the writer thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """Stream handler that writes a whole batch of records with a single write and flush"""
+
+    def emit_batch(self, records: List[logging.LogRecord]):
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
+        with self.lock:
+            self.stream.write("".join(lines))
+            self.flush()
+
+
+class BackgroundLogWriter(threading.Thread):
+    """Writer thread draining the log queue in batches into the real handlers"""
+
+    def __init__(self, log_queue: queue.Queue, handlers: List[logging.Handler],
+                 queue_handler: DroppingQueueHandler,
+                 batch_size: int = LOG_BATCH_SIZE, flush_interval: float = LOG_FLUSH_INTERVAL,
+                 tick_callbacks: Optional[List[Callable[[], None]]] = None):
+        super().__init__(name="log-writer", daemon=True)
+        self.queue = log_queue
+        self.handlers = handlers
+        self.queue_handler = queue_handler
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Called from the writer thread at least every flush_interval
+        self.tick_callbacks = tick_callbacks or []
+        self._reported_dropped = 0
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self.tick()
+                continue
+
+            batch = []
+            while True:
+                if record is _STOP:
+                    stopping = True
+                else:
+                    batch.append(record)
+                if stopping or len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            self.write(batch)
+            self.tick()
+
+    def tick(self):
+        self.report_dropped()
+        for callback in self.tick_callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def report_dropped(self):
+        """Emit a summary record for anything dropped since the last report"""
+        dropped = self.queue_handler.dropped
+        if dropped > self._reported_dropped:
+            record = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                "Log queue full: dropped %d records (%d total)",
+                (dropped - self._reported_dropped, dropped), None
+            )
+            self._reported_dropped = dropped
+            self.write([record])
+
+    def write(self, records: List[logging.LogRecord]):
+        for handler in self.handlers:
+            accepted = [record for record in records if record.levelno >= handler.level]
+            if not accepted:
+                continue
+            if isinstance(handler, BatchStreamHandler):
+                handler.emit_batch(accepted)
+            else:
+                for record in accepted:
+                    handler.handle(record)
+
+    def stop(self, timeout: float = 5.0):
+        """Ask the writer to drain the queue and exit"""
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self.join(timeout)
+
+
+_writer: Optional[BackgroundLogWriter] = None
+
+
+def setup_logging(
+    log_level: str = "INFO",
+    log_file: Optional[str] = None,
+    queue_size: int = LOG_QUEUE_SIZE,
+    max_bytes: int = LOG_FILE_MAX_BYTES,
+    backup_count: int = LOG_FILE_BACKUP_COUNT,
+):
+    """
+    Setup logging configuration.
+
+    Log calls only enqueue the record; a background writer thread formats and
+    writes them in batches to the console and, if log_file is set, to a
+    rotating file. When the bounded queue is full records are dropped and
+    counted rather than blocking the request.
+    """
+    global _writer
+
     level = getattr(logging, log_level.upper(), logging.INFO)
 
     # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    # Console handler
+    console_handler = BatchStreamHandler()
+    console_handler.setFormatter(formatter)
+    handlers: List[logging.Handler] = [console_handler]
+
+    # Optional rotating file sink
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    shutdown_logging()
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = DroppingQueueHandler(log_queue)
 
     # Get root logger
     logger = logging.getLogger()
@@ -26,14 +204,98 @@ def setup_logging(log_level: str = "INFO"):
 
     # Clear existing handlers
     logger.handlers.clear()
+    logger.addHandler(queue_handler)
 
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    _writer = BackgroundLogWriter(log_queue, handlers, queue_handler,
+                                  tick_callbacks=[flush_security_summaries])
+    _writer.start()
 
     return logger
 
+
+def shutdown_logging():
+    """Flush pending records and stop the background writer"""
+    global _writer
+
+    if _writer is None:
+        return
+    flush_security_summaries(force=True)
+    _writer.stop()
+    for handler in _writer.handlers:
+        handler.close()
+    _writer = None
+
+
+atexit.register(shutdown_logging)
+
+
+def use_external_log_rotation():
+    """
+    Stop rotating the log file from this process, for servers that fork.
+
+    Processes sharing a RotatingFileHandler would each rotate the file by
+    their own count and rename it under each other, losing lines. Swap it for
+    a WatchedFileHandler, which never rotates but reopens the file after
+    something else - logrotate, say - has moved it away.
+    """
+    if _writer is None:
+        return
+    handlers, replaced = [], []
+    for handler in _writer.handlers:
+        if isinstance(handler, logging.handlers.RotatingFileHandler):
+            watched = logging.handlers.WatchedFileHandler(handler.baseFilename, encoding=handler.encoding)
+            watched.setFormatter(handler.formatter)
+            watched.setLevel(handler.level)
+            replaced.append(handler)
+            handler = watched
+        handlers.append(handler)
+    # The writer thread picks up the new list on its next batch
+    _writer.handlers = handlers
+    for handler in replaced:
+        handler.close()
+
+
+def _restart_writer_after_fork():
+    """
+    Only the forking thread survives fork(), so a child inherits a queue
+    nobody drains. Give it a fresh queue and writer with the same handlers.
+    """
+    global _writer
+
+    if _writer is None:
+        return
+    inherited = _writer
+    log_queue: queue.Queue = queue.Queue(maxsize=inherited.queue.maxsize)
+    queue_handler = DroppingQueueHandler(log_queue)
+
+    logger = logging.getLogger()
+    logger.handlers = [queue_handler if handler is inherited.queue_handler else handler
+                       for handler in logger.handlers]
+
+    _writer = BackgroundLogWriter(log_queue, inherited.handlers, queue_handler,
+                                  batch_size=inherited.batch_size, flush_interval=inherited.flush_interval,
+                                  tick_callbacks=inherited.tick_callbacks)
+    _writer.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_writer_after_fork)
+
+
+class _JsonMessage:
+    """Defers json.dumps of a structured event until the record is formatted"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: dict):
+        self.data = data
+
+    def __str__(self):
+        return json.dumps(self.data, default=str)
+
+
+_LEVELS = {level: getattr(logging, level.value) for level in LogLevel}
+
 def log_event(
     event_type: str,
     message: str,
@@ -45,6 +307,10 @@ def log_event(
     """Log a structured event"""
     logger = logging.getLogger(__name__)
 
+    levelno = _LEVELS[level]
+    if not logger.isEnabledFor(levelno):
+        return
+
     log_data = {
         "timestamp": datetime.utcnow().isoformat(),
         "event_type": event_type,
@@ -55,15 +321,132 @@ def log_event(
         **kwargs
     }
 
-    log_method = getattr(logger, level.value.lower())
-    log_method(json.dumps(log_data))
+    logger.log(levelno, "%s", _JsonMessage(log_data))
+
+class SecurityEventLimit(NamedTuple):
+    rate: float              # events per second let through once the burst is spent
+    burst: float             # token bucket capacity
+    sample_rate: float = 1.0  # fraction of events considered for logging at all
+
+
+# Failure events are what floods the logs during credential-stuffing bursts
+SECURITY_EVENT_LIMITS: Dict[str, SecurityEventLimit] = {
+    "FAILED_USER_LOGIN": SecurityEventLimit(rate=2, burst=20),
+    "FAILED_USER_REGISTRATION": SecurityEventLimit(rate=2, burst=20),
+    "FAILED_AUTH": SecurityEventLimit(rate=2, burst=20),
+    "RATE_LIMITED": SecurityEventLimit(rate=2, burst=20),
+}
+DEFAULT_SECURITY_EVENT_LIMIT = SecurityEventLimit(rate=50, burst=200)
+
+# Suppressed events are rolled up into one summary per event type per window
+SECURITY_SUMMARY_INTERVAL = 60.0  # seconds
+SECURITY_SUMMARY_TOP_SOURCES = 20
+
+
+class SecurityEventLimiter:
+    """
+    Per-event-type sampling and token-bucket rate limiting for security events.
+
+    Events that are sampled out or over the limit are not logged individually;
+    they are counted per (user_id, ip) and reported as a summary record once
+    per window.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, SecurityEventLimit]] = None,
+                 default_limit: SecurityEventLimit = DEFAULT_SECURITY_EVENT_LIMIT,
+                 summary_interval: float = SECURITY_SUMMARY_INTERVAL,
+                 top_sources: int = SECURITY_SUMMARY_TOP_SOURCES):
+        self.limits = SECURITY_EVENT_LIMITS if limits is None else limits
+        self.default_limit = default_limit
+        self.summary_interval = summary_interval
+        self.top_sources = top_sources
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._suppressed: Dict[str, Counter] = defaultdict(Counter)
+        self._window_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self, event_type: str, user_id: Optional[str] = None,
+              ip: Optional[str] = None, now: Optional[float] = None) -> bool:
+        """Whether this event should be logged; otherwise it is counted for the summary"""
+        limit = self.limits.get(event_type, self.default_limit)
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            bucket = self._buckets.get(event_type)
+            if bucket is None:
+                bucket = self._buckets[event_type] = TokenBucket(limit.rate, limit.burst, now)
+
+            if (limit.sample_rate >= 1 or random.random() < limit.sample_rate) and bucket.consume(now=now):
+                return True
+
+            self._suppressed[event_type][(user_id, ip)] += 1
+            return False
+
+    def summary_due(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return now - self._window_start >= self.summary_interval
+
+    def take_summaries(self, now: Optional[float] = None, force: bool = False) -> List[dict]:
+        """Close the current window and return one summary per event type with suppressed events"""
+        now = time.monotonic() if now is None else now
+        if not force and not self.summary_due(now):
+            return []
+
+        with self._lock:
+            suppressed, self._suppressed = self._suppressed, defaultdict(Counter)
+            window_seconds = round(now - self._window_start, 3)
+            self._window_start = now
+
+        summaries = []
+        for event_type, counts in suppressed.items():
+            summaries.append({
+                "event_type": event_type,
+                "suppressed": sum(counts.values()),
+                "window_seconds": window_seconds,
+                "sources": [
+                    {"user_id": user_id, "ip": ip, "count": count}
+                    for (user_id, ip), count in counts.most_common(self.top_sources)
+                ],
+                "distinct_sources": len(counts)
+            })
+        return summaries
+
+
+security_event_limiter = SecurityEventLimiter()
+
+
+def flush_security_summaries(force: bool = False):
+    """Log summary records for security events suppressed in the last window"""
+    for summary in security_event_limiter.take_summaries(force=force):
+        event_type = summary.pop("event_type")
+        log_event(
+            event_type=f"SECURITY_{event_type}_SUPPRESSED",
+            message=f"{summary['suppressed']} {event_type} events suppressed",
+            level=LogLevel.WARNING,
+            **summary
+        )
+
+
+def log_security_event(event_type: str, message: str, user_id: Optional[str] = None,
+                       ip: Optional[str] = None, **kwargs):
+    """
+    Log a security-related event.
+    Subject to per-event-type sampling and rate limits; suppressed events are
+    reported in periodic summaries instead.
+    """
+    if security_event_limiter.summary_due():
+        flush_security_summaries()
+
+    if not security_event_limiter.allow(event_type, user_id, ip):
+        return
+
+    if ip is not None:
+        kwargs["ip"] = ip
 
-def log_security_event(event_type: str, message: str, user_id: Optional[str] = None, **kwargs):
-    """Log a security-related event"""
     log_event(
         event_type=f"SECURITY_{event_type}",
         message=message,
         level=LogLevel.WARNING if event_type == "FAILED_AUTH" else LogLevel.INFO,
         user_id=user_id,
         **kwargs
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,243 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# A collector returns (name, type, help, [(labels, value), ...]) tuples at scrape time
+Sample = Tuple[Dict[str, str], float]
+CollectedMetric = Tuple[str, str, str, List[Sample]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _labels(self, labelvalues: Tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, labelvalues))
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter; one value per label combination"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        for labelvalues, value in self._values.items():
+            yield self.name, self._labels(labelvalues), value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) - amount
+
+    def set(self, value: float, *labelvalues):
+        self._values[labelvalues] = value
+
+    def samples(self):
+        for labelvalues, value in self._values.items():
+            yield self.name, self._labels(labelvalues), value
+
+
+class Histogram(_Metric):
+    """
+    Bucketed distribution. Observations only bump one bucket counter; the
+    cumulative counts required by the exposition format are built at scrape time.
+    """
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labelvalues -> [per-bucket counts (last one is +Inf), sum, count]
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues):
+        state = self._values.get(labelvalues)
+        if state is None:
+            state = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def samples(self):
+        for labelvalues, (counts, total, count) in self._values.items():
+            labels = self._labels(labelvalues)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(float(bound))}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class MetricsRegistry:
+    """In-process metrics registry rendering the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[CollectedMetric]]] = []
+        # Added to every sample, e.g. the worker's pid under the pre-forking server
+        self.const_labels: Dict[str, str] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[CollectedMetric]]):
+        """Register a callback producing gauge-like values computed at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        const_labels = self.const_labels
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.samples():
+                if const_labels:
+                    labels = {**labels, **const_labels}
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for collector in self._collectors:
+            for name, type_name, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {type_name}")
+                for labels, value in samples:
+                    if const_labels:
+                        labels = {**labels, **const_labels}
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code",
+    ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template",
+    ("method", "route")
+)
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served", ("method",)
+)
+db_queries_per_request = registry.histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request",
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100)
+)
+db_time_per_request_seconds = registry.histogram(
+    "db_time_per_request_seconds", "Time spent executing SQL per HTTP request"
+)
+admission_in_flight = registry.gauge(
+    "admission_in_flight", "Requests holding an admission slot", ("route_class",)
+)
+admission_queue_depth = registry.gauge(
+    "admission_queue_depth", "Requests waiting for an admission slot", ("route_class",)
+)
+admission_queue_wait_seconds = registry.histogram(
+    "admission_queue_wait_seconds", "Time admitted requests waited for a slot", ("route_class",)
+)
+admission_rejected_total = registry.counter(
+    "admission_rejected_total", "Requests shed by admission control", ("route_class", "reason")
+)
+rate_limited_total = registry.counter(
+    "rate_limited_total", "Requests rejected by the rate limiter", ("policy",)
+)
+rate_limit_store_errors_total = registry.counter(
+    "rate_limit_store_errors_total", "Shared rate limit store calls that failed and fell back to local buckets"
+)
+
+
+def collect_db_pool() -> Iterable[CollectedMetric]:
+    """Connection pool gauges for the application engine"""
+    from src.database.engine import engine
+
+    pool = engine.pool
+    for name, attr, documentation in (
+        ("db_pool_size", "size", "Configured connection pool size"),
+        ("db_pool_checked_out", "checkedout", "Connections currently checked out"),
+        ("db_pool_checked_in", "checkedin", "Idle connections in the pool"),
+        ("db_pool_overflow", "overflow", "Connections opened beyond the pool size"),
+    ):
+        # Not every pool class (e.g. NullPool, StaticPool) tracks these
+        method: Optional[Callable] = getattr(pool, attr, None)
+        if method is not None:
+            # QueuePool.overflow() starts at -size; report only real overflow
+            value = max(0, method()) if attr == "overflow" else method()
+            yield name, "gauge", documentation, [({}, float(value))]
+
+
+def collect_password_hasher() -> Iterable[CollectedMetric]:
+    """Password hash executor statistics"""
+    from src.services.user_service import password_hasher
+
+    yield ("password_hash_workers", "gauge", "Password hash executor threads",
+           [({}, password_hasher.max_workers)])
+    yield ("password_hash_in_flight", "gauge", "Password hash operations queued or running",
+           [({}, password_hasher.in_flight)])
+    yield ("password_hash_operations_total", "counter", "Completed password hash operations",
+           [({"op": op}, count) for op, count in password_hasher.completed.items()])
+    yield ("password_hash_seconds_total", "counter", "Time spent in password hash operations",
+           [({"op": op}, seconds) for op, seconds in password_hasher.seconds.items()])
+
+
+registry.register_collector(collect_db_pool)
+registry.register_collector(collect_password_hasher)
@@ -0,0 +1,164 @@
+import cProfile
+import json
+import os
+import pstats
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+import jwt
+from jwt import InvalidTokenError
+
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-ID"
+PROFILE_TOKEN_SCOPE = "profile"
+PROFILE_TOKEN_ALGORITHM = "HS256"
+
+PROFILE_TOP_N = 30
+PROFILE_STORE_SIZE = 50
+
+
+def create_profile_token(secret: str, expires_in: timedelta = timedelta(minutes=15)) -> str:
+    """Short-lived admin token that enables profiling and the profile endpoints"""
+    payload = {"scope": PROFILE_TOKEN_SCOPE, "exp": datetime.utcnow() + expires_in}
+    return jwt.encode(payload, secret, algorithm=PROFILE_TOKEN_ALGORITHM)
+
+
+def verify_profile_token(secret: str, token: Optional[str]) -> bool:
+    """Whether the token was signed with the profiling secret and has not expired"""
+    if not secret or not token:
+        return False
+    try:
+        payload = jwt.decode(token, secret, algorithms=[PROFILE_TOKEN_ALGORITHM])
+    except InvalidTokenError:
+        return False
+    return payload.get("scope") == PROFILE_TOKEN_SCOPE
+
+
+def top_functions(profiler: cProfile.Profile, limit: int = PROFILE_TOP_N) -> List[dict]:
+    """The functions with the highest cumulative time in a finished profile"""
+    stats = pstats.Stats(profiler)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        primitive_calls, total_calls, tottime, cumtime, _ = stats.stats[func]
+        filename, line, name = func
+        rows.append({
+            "function": f"{filename}:{line}({name})" if line else name,
+            "ncalls": total_calls,
+            "primitive_calls": primitive_calls,
+            "tottime": round(tottime, 6),
+            "cumtime": round(cumtime, 6),
+        })
+    return rows
+
+
+class ProfileStore:
+    """
+    Bounded store of recent request profiles, oldest evicted first.
+
+    Profiles are kept in memory unless use_directory() is called; then they
+    are JSON files in that directory, so every worker process of the
+    pre-forking server sees the profiles the others recorded.
+    """
+
+    def __init__(self, max_profiles: int = PROFILE_STORE_SIZE):
+        self.max_profiles = max_profiles
+        self.directory: Optional[Path] = None
+        self._profiles: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def use_directory(self, directory: str):
+        """Keep profiles as files in `directory`, shared with other processes using it"""
+        self.directory = Path(directory)
+
+    def add(self, profile: dict):
+        if self.directory is not None:
+            path = self.directory / f"{profile['id']}.json"
+            partial = path.with_suffix(".tmp")
+            partial.write_text(json.dumps(profile))
+            # Readers in other processes never see a half-written file
+            os.replace(partial, path)
+            for old in self._files()[self.max_profiles:]:
+                old.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._profiles[profile["id"]] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        if self.directory is not None:
+            # The id comes from the URL; only ever read our own hex-named files
+            if not profile_id.isalnum():
+                return None
+            return self._read(self.directory / f"{profile_id}.json")
+
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def summaries(self) -> List[dict]:
+        """Every stored profile without its function table, newest first"""
+        if self.directory is not None:
+            profiles = [profile for profile in map(self._read, self._files()) if profile is not None]
+        else:
+            with self._lock:
+                profiles = list(reversed(self._profiles.values()))
+        return [
+            {key: value for key, value in profile.items() if key != "functions"}
+            for profile in profiles
+        ]
+
+    def _files(self) -> List[Path]:
+        """Profile files, newest first"""
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime_ns, path))
+            except FileNotFoundError:
+                # Evicted by another process meanwhile
+                pass
+        return [path for _, path in sorted(files, reverse=True)]
+
+    @staticmethod
+    def _read(path: Path) -> Optional[dict]:
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+
+
+profile_store = ProfileStore()
+
+# cProfile hooks the whole thread, so only one request is profiled at a time
+profiler_lock = threading.Lock()
+
+
+def profile_record(profile_id: str, method: str, path: str, trigger: str, status_code: int,
+                   duration: float, profiler: cProfile.Profile, top_n: int = PROFILE_TOP_N) -> dict:
+    return {
+        "id": profile_id,
+        "method": method,
+        "path": path,
+        "trigger": trigger,
+        "status_code": status_code,
+        "duration_ms": round(duration * 1000, 3),
+        "created_at": datetime.utcnow().isoformat(),
+        "functions": top_functions(profiler, top_n),
+    }
+
+
+if __name__ == "__main__":
+    # Print a profiling token for PROFILING_SECRET: python -m src.utils.profiling [minutes]
+    import sys
+    from src.config.settings import get_settings
+
+    secret = get_settings().profiling_secret
+    if not secret:
+        sys.exit("PROFILING_SECRET is not set")
+    minutes = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    print(create_profile_token(secret, timedelta(minutes=minutes)))
@@ -0,0 +1,111 @@
+from datetime import date, datetime
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Iterable, Optional, Tuple
+from uuid import UUID
+import json
+
+from starlette.responses import Response
+
+from src.utils.server_timing import timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+# Field order matches TaskRead so the output is identical to the
+# response_model path
+TASK_FIELDS = ("title", "description", "completed", "id", "user_id", "created_at", "updated_at")
+
+
+def _default(obj: Any) -> Any:
+    """Encode the non-JSON types found on our ORM rows"""
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Built once and reused - json.dumps would construct a new encoder per call
+_json_encoder = json.JSONEncoder(
+    ensure_ascii=False,
+    allow_nan=False,
+    separators=(",", ":"),
+    default=_default,
+)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact JSON bytes, UUID and datetime aware"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return _json_encoder.encode(content).encode("utf-8")
+
+
+@lru_cache(maxsize=128)
+def _task_field_reader(fields: Tuple[str, ...]):
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        # attrgetter with a single name returns the bare value, not a tuple
+        return lambda task: (getter(task),)
+    return getter
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse a comma-separated fields= query value into TaskRead field names.
+    Returns them in TaskRead order; raises ValueError for unknown fields.
+    """
+    if not fields:
+        return TASK_FIELDS
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(TASK_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    if not requested:
+        return TASK_FIELDS
+    return tuple(field for field in TASK_FIELDS if field in requested)
+
+
+def task_to_dict(task: Any, fields: Tuple[str, ...] = TASK_FIELDS) -> dict:
+    """Read the TaskRead fields straight off a Task row, without model validation"""
+    return dict(zip(fields, _task_field_reader(fields)(task)))
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with the shared precompiled encoder.
+
+    Returning this from a handler bypasses FastAPI's response_model
+    validation and jsonable_encoder pass, so callers are responsible for
+    producing the documented shape (see task_response / task_list_response).
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            return dumps(content)
+
+
+def task_response(task: Any, status_code: int = 200,
+                  fields: Tuple[str, ...] = TASK_FIELDS) -> FastJSONResponse:
+    """Serialize a single Task row in the TaskRead shape, limited to the given fields"""
+    with timed("serialize"):
+        content = task_to_dict(task, fields)
+    return FastJSONResponse(content, status_code=status_code)
+
+
+def task_list_response(tasks: Iterable[Any], total_count: int,
+                       fields: Tuple[str, ...] = TASK_FIELDS) -> FastJSONResponse:
+    """Serialize Task rows in the TaskListResponse shape, limited to the given fields"""
+    with timed("serialize"):
+        content = {
+            "tasks": [task_to_dict(task, fields) for task in tasks],
+            "total_count": total_count
+        }
+    return FastJSONResponse(content)
@@ -0,0 +1,68 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+
+class ServerTimings:
+    """Accumulated time per phase (auth, db, hash, serialize) for one request"""
+
+    __slots__ = ("durations",)
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+
+# Set only while the Server-Timing middleware is serving a request
+current_timings: ContextVar[Optional[ServerTimings]] = ContextVar("current_timings", default=None)
+
+
+class _Timer:
+    __slots__ = ("timings", "name", "start")
+
+    def __init__(self, timings: ServerTimings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+def timed(name: str):
+    """
+    Context manager adding the elapsed time of its block to the named phase.
+
+    With Server-Timing disabled this is a single contextvar lookup returning
+    a shared no-op timer.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        return _NOOP_TIMER
+    return _Timer(timings, name)
+
+
+def record_timing(name: str, seconds: float):
+    """Add an already measured duration to the named phase"""
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
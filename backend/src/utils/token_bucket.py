@@ -0,0 +1,44 @@
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `capacity` tokens, refilled at `rate`
+    tokens per second. Refill is computed lazily on each call, so an idle
+    bucket costs nothing.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float, now: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic() if now is None else now
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def available(self, now: Optional[float] = None) -> float:
+        """Tokens in the bucket now, without taking any"""
+        self._refill(time.monotonic() if now is None else now)
+        return self.tokens
+
+    def consume(self, tokens: float = 1, now: Optional[float] = None) -> bool:
+        """Take tokens if available; returns False when the bucket is empty"""
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def retry_after(self, tokens: float = 1) -> float:
+        """Seconds until the requested tokens will be available"""
+        missing = tokens - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float("inf")
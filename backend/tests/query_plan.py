@@ -0,0 +1,101 @@
+"""
+Query plan assertions.
+
+QueryPlanChecker records the statements an engine runs while a block of
+code executes, then EXPLAINs each one on the same database and reports full
+table scans and sorts that no index serves: EXPLAIN QUERY PLAN on SQLite,
+EXPLAIN (FORMAT JSON) on Postgres with sequential scans and sorts priced
+out, so any that remain mean there is no usable index.
+"""
+
+import json
+import re
+from contextlib import contextmanager
+from typing import Iterable, List, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel
+
+# Statements worth planning; INSERTs and transaction control have no access path
+_PLANNED_STATEMENT = re.compile(r"^\s*(SELECT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+_SQLITE_TABLE_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+_SQLITE_TEMP_BTREE = re.compile(r"^USE TEMP B-TREE FOR (.+)$")
+
+
+def sqlite_plan_violations(plan_details: Iterable[str], tables: Set[str]) -> List[str]:
+    """Problems in the detail column of SQLite EXPLAIN QUERY PLAN output"""
+    violations = []
+    for detail in plan_details:
+        scan = _SQLITE_TABLE_SCAN.match(detail)
+        # "SCAN t" on a subquery alias is not a table scan
+        if scan and scan.group(1) in tables:
+            violations.append(f"full table scan: {detail}")
+        sort = _SQLITE_TEMP_BTREE.match(detail)
+        if sort:
+            violations.append(f"sort without an index: {detail}")
+    return violations
+
+
+def postgres_plan_violations(plan: dict, tables: Set[str]) -> List[str]:
+    """Problems in one node tree of Postgres EXPLAIN (FORMAT JSON) output"""
+    violations = []
+    node_type = plan.get("Node Type")
+    if node_type == "Seq Scan" and plan.get("Relation Name") in tables:
+        violations.append(f"full table scan: Seq Scan on {plan['Relation Name']}")
+    if node_type in ("Sort", "Incremental Sort"):
+        violations.append(f"sort without an index: {node_type} on {', '.join(plan.get('Sort Key', []))}")
+    for child in plan.get("Plans", []):
+        violations.extend(postgres_plan_violations(child, tables))
+    return violations
+
+
+class QueryPlanChecker:
+    """Captures statements run on an engine and checks their query plans"""
+
+    def __init__(self, engine: AsyncEngine, tables: Iterable[str] = ()):
+        self.engine = engine
+        self.tables = set(tables) or set(SQLModel.metadata.tables)
+        self.statements: List[Tuple[str, tuple]] = []
+
+    @contextmanager
+    def capture(self):
+        """Record every plannable statement executed inside the block"""
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and _PLANNED_STATEMENT.match(statement):
+                self.statements.append((statement, parameters))
+
+        sync_engine = self.engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", record)
+        try:
+            yield self.statements
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", record)
+
+    async def explain(self, statement: str, parameters) -> List[str]:
+        """Violations in the plan of one captured statement"""
+        dialect = self.engine.dialect.name
+        async with self.engine.connect() as conn:
+            if dialect == "sqlite":
+                result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                return sqlite_plan_violations([row[-1] for row in result], self.tables)
+
+            if dialect == "postgresql":
+                # With these priced out the planner still picks them only when no index applies
+                await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                await conn.exec_driver_sql("SET LOCAL enable_sort = off")
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = result.scalar()
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                await conn.rollback()
+                return postgres_plan_violations(plan[0]["Plan"], self.tables)
+
+        raise NotImplementedError(f"query plan checks are not supported on {dialect}")
+
+    async def violations(self) -> List[str]:
+        """Violations of every captured statement, each prefixed with its SQL"""
+        found = []
+        for statement, parameters in self.statements:
+            for violation in await self.explain(statement, parameters):
+                found.append(f"{violation}\n    in: {' '.join(statement.split())}")
+        return found
@@ -0,0 +1,68 @@
+"""
+AdmissionMiddleware route classes and their limits.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from src.middleware.admission import AdmissionMiddleware, route_class
+
+
+def http_scope(method: str, path: str) -> dict:
+    return {"type": "http", "method": method, "path": path, "headers": []}
+
+
+@pytest.mark.parametrize("method,path,expected", [
+    ("GET", "/api/u1/tasks", "read"),
+    ("GET", "/api/u1/tasks/t1", "read"),
+    ("POST", "/api/u1/tasks", "write"),
+    ("POST", "/api/u1/batch", "write"),
+    ("POST", "/api/v1/login", "auth"),
+    ("POST", "/api/v1/register", "auth"),
+    ("GET", "/api/u1/tasks/export", "bulk"),
+    ("POST", "/api/u1/tasks/import", "bulk"),
+    ("OPTIONS", "/api/u1/tasks", None),
+    ("GET", "/metrics", None),
+])
+def test_route_class(method, path, expected):
+    assert route_class(http_scope(method, path)) == expected
+
+
+def test_streaming_transfers_do_not_hold_write_slots():
+    async def run():
+        release = asyncio.Event()
+        statuses = []
+
+        async def app(scope, receive, send):
+            # Bulk transfers stream until released; everything else answers at once
+            if scope["path"].endswith(("/export", "/import")):
+                await release.wait()
+            statuses.append((scope["path"], 200))
+
+        middleware = AdmissionMiddleware(
+            app, read_limit=1, write_limit=1, auth_limit=1, bulk_limit=1, queue_size=1, queue_timeout=0.05
+        )
+
+        async def request(method, path):
+            try:
+                await middleware(http_scope(method, path), None, None)
+            except HTTPException as e:
+                statuses.append((path, e.status_code))
+
+        # Two imports: one streams, the other queues behind it and is shed at the deadline
+        imports = [asyncio.create_task(request("POST", f"/api/u{i}/tasks/import")) for i in range(2)]
+        await asyncio.sleep(0)
+        await request("POST", "/api/u1/tasks")
+        await request("GET", "/api/u1/tasks")
+        await asyncio.sleep(0.1)
+        release.set()
+        await asyncio.gather(*imports)
+        return statuses
+
+    statuses = asyncio.run(run())
+
+    assert statuses.count(("/api/u1/tasks", 200)) == 2
+    assert ("/api/u1/tasks/import", 503) in statuses
+    assert ("/api/u0/tasks/import", 200) in statuses
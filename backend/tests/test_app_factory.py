@@ -0,0 +1,59 @@
+"""
+An app built by create_app(settings) follows those settings, not the
+process environment's.
+"""
+
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.main import create_app
+from src.auth.jwt_handler import create_access_token
+from src.config.settings import Settings, get_settings
+from src.utils.profiling import PROFILE_TOKEN_HEADER, create_profile_token
+
+SECRET = "factory-profiling-secret"
+JWT_SECRET = "factory-jwt-secret"
+
+
+def factory_client(**overrides) -> TestClient:
+    # No `with`: the lifespan warm-up isn't needed for these routes
+    return TestClient(create_app(Settings(rate_limit=False, **overrides)))
+
+
+def test_admin_routes_use_factory_settings():
+    assert not get_settings().profiling_secret
+    client = factory_client(profiling_secret=SECRET)
+
+    token = create_profile_token(SECRET, timedelta(minutes=5))
+    response = client.get("/admin/profiles", headers={PROFILE_TOKEN_HEADER: token})
+
+    assert response.status_code == 200
+    assert "profiles" in response.json()
+    assert client.get("/admin/profiles").status_code == 403
+
+
+def test_tokens_use_factory_jwt_secret():
+    settings = Settings(rate_limit=False, better_auth_jwt_secret=JWT_SECRET)
+    client = TestClient(create_app(settings))
+    path = f"/api/{uuid4()}/tasks"
+
+    # Signed with the factory's secret: authenticated, then refused for another user's tasks
+    token = create_access_token({"user_id": str(uuid4())}, settings=settings)
+    assert client.get(path, headers={"Authorization": f"Bearer {token}"}).status_code == 403
+
+    # Signed with the environment's secret: not a valid token for this app
+    token = create_access_token({"user_id": str(uuid4())})
+    assert client.get(path, headers={"Authorization": f"Bearer {token}"}).status_code == 401
+
+
+def test_sampled_profiling_requires_secret():
+    # Without a secret there would be no endpoint to read the sampled profiles from
+    with pytest.raises(ValueError, match="PROFILING_SECRET"):
+        create_app(Settings(profiling_sample_rate=0.1))
+
+    client = factory_client(profiling_secret=SECRET, profiling_sample_rate=0.1)
+    token = create_profile_token(SECRET, timedelta(minutes=5))
+    assert client.get("/admin/profiles", headers={PROFILE_TOKEN_HEADER: token}).status_code == 200
@@ -0,0 +1,83 @@
+"""
+TaskBatchService results must match what was committed.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel, func, select
+
+from src.models.task import Task
+from src.models.user import User
+from src.schemas.task import BatchOperation
+from src.services.batch_service import TaskBatchService
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # No pooling: each test runs on its own event loop
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'batch.db'}", poolclass=NullPool)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    asyncio.run(setup())
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+def run_batch(engine, operations, atomic):
+    """Execute the batch for a fresh user; returns the response and the tasks the user has afterwards"""
+    async def run():
+        user_id = uuid4()
+        async with AsyncSession(engine) as session:
+            session.add(User(id=user_id, email=f"batch-{user_id.hex}@example.com", hashed_password="x"))
+            await session.commit()
+        async with AsyncSession(engine) as session:
+            response = await TaskBatchService(session, user_id).execute(
+                [BatchOperation(**operation) for operation in operations], atomic=atomic
+            )
+        async with AsyncSession(engine) as session:
+            count = (await session.execute(
+                select(func.count(Task.id)).where(Task.user_id == user_id)
+            )).scalar_one()
+        return response, count
+
+    return asyncio.run(run())
+
+
+OPERATIONS = [
+    {"op": "create", "data": {"title": "First"}},
+    {"op": "create", "data": {"title": "Second"}},
+    {"op": "update", "task_id": str(uuid4()), "data": {"title": "Missing"}},
+    {"op": "create", "data": {"title": "After the failure"}},
+]
+
+
+def test_atomic_batch_failure_reports_nothing_applied(engine):
+    response, count = run_batch(engine, OPERATIONS, atomic=True)
+    results = response["results"]
+
+    assert response["committed"] is False
+    assert count == 0
+    # Earlier operations were rolled back, the failure keeps its own error, later ones never ran
+    assert [result["status"] for result in results] == [424, 424, 404, 424]
+    assert all(result["task"] is None for result in results)
+    assert results[0]["detail"] == "Not applied: batch rolled back"
+    assert results[2]["error_code"] is not None
+    assert results[3]["detail"] == "Not executed: batch aborted"
+
+
+def test_non_atomic_batch_keeps_successful_operations(engine):
+    response, count = run_batch(engine, OPERATIONS, atomic=False)
+    results = response["results"]
+
+    assert response["committed"] is True
+    assert count == 3
+    assert [result["status"] for result in results] == [201, 201, 404, 201]
+    assert results[0]["task"]["title"] == "First"
+    assert results[2]["task"] is None
@@ -0,0 +1,28 @@
+"""
+Benchmark statistics helpers.
+"""
+
+import pytest
+
+from benchmarks.common import percentile
+
+
+@pytest.mark.parametrize("count,pct,expected", [
+    (100, 50, 50),
+    (100, 95, 95),
+    (100, 99, 99),
+    (100, 100, 100),
+    (100, 7, 7),
+    (10, 50, 5),
+    (10, 95, 10),
+    (10, 1, 1),
+    (3, 50, 2),
+    (1, 99, 1),
+])
+def test_percentile_nearest_rank(count, pct, expected):
+    values = [float(value) for value in range(1, count + 1)]
+    assert percentile(values, pct) == expected
+
+
+def test_percentile_of_nothing():
+    assert percentile([], 95) == 0.0
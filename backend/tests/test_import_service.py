@@ -0,0 +1,141 @@
+"""
+TaskImporter reports every rejected line and still commits the valid ones.
+"""
+
+import asyncio
+import json
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel, select
+
+from src.app.main import app
+from src.auth.jwt_handler import create_access_token
+from src.models.task import Task
+from src.models.user import User
+from src.services.import_service import TaskImporter
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # No pooling: each test runs on its own event loop
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'import.db'}", poolclass=NullPool)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    asyncio.run(setup())
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+def run_import(engine, body: bytes, import_format="ndjson", batch_size=500, chunk_size=7):
+    """Import `body` for a fresh user in small chunks; returns the report and the titles committed"""
+    async def chunks():
+        # Small chunks split lines, and multi-byte characters, across reads
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    async def run():
+        user_id = uuid4()
+        async with AsyncSession(engine) as session:
+            session.add(User(id=user_id, email=f"import-{user_id.hex}@example.com", hashed_password="x"))
+            await session.commit()
+        async with AsyncSession(engine) as session:
+            report = await TaskImporter(session, user_id, import_format, batch_size=batch_size).run(chunks())
+        async with AsyncSession(engine) as session:
+            titles = (await session.execute(
+                select(Task.title).where(Task.user_id == user_id).order_by(Task.title)
+            )).scalars().all()
+        return report.to_dict(), titles
+
+    return asyncio.run(run())
+
+
+def test_ndjson_reports_bad_lines_and_commits_the_rest(engine):
+    body = "\n".join([
+        json.dumps({"title": "Café"}),
+        '{"title": "Broken"',
+        "",
+        '["not", "an", "object"]',
+        json.dumps({"title": "   "}),
+        json.dumps({"title": "Other user", "user_id": str(uuid4())}),
+        json.dumps({"title": "Done", "completed": True, "description": "Last line, no newline"}),
+    ]).encode()
+
+    report, titles = run_import(engine, body)
+
+    assert report["imported"] == 2
+    assert report["failed"] == 4
+    assert report["errors_truncated"] is False
+    assert [error["line"] for error in report["errors"]] == [2, 4, 5, 6]
+    assert report["errors"][0]["error"].startswith("Invalid JSON: ")
+    assert report["errors"][1]["error"] == "Record must be a JSON object"
+    assert "Title must not be empty" in report["errors"][2]["error"]
+    assert report["errors"][3]["error"] == "Cannot create task for another user"
+    assert titles == ["Café", "Done"]
+
+
+def test_csv_reports_bad_rows_and_keeps_multiline_fields(engine):
+    body = (
+        "title,description,completed\n"
+        "First,,false\n"
+        "Too,many,columns,here\n"
+        '"Multi","line\ndescription",true\n'
+        ",missing title,false\n"
+        '"Unterminated,never closed,false\n'
+        "Swallowed by the open quote,,false\n"
+    ).encode()
+
+    report, titles = run_import(engine, body, import_format="csv")
+
+    assert report["imported"] == 2
+    assert report["failed"] == 3
+    # Lines are physical input lines; the multi-line record takes two of them
+    assert [error["line"] for error in report["errors"]] == [3, 6, 7]
+    assert report["errors"][0]["error"] == "Expected 3 columns, got 4"
+    assert "Title must not be empty" in report["errors"][1]["error"]
+    # The open quote swallows the rest of the file into one record
+    assert report["errors"][2]["error"] == "Unterminated quoted field"
+    assert titles == ["First", "Multi"]
+
+
+def test_failed_batch_is_reported_and_other_batches_are_committed(engine):
+    def fail_on_marker(conn, cursor, statement, parameters, context, executemany):
+        rows = parameters if executemany else [parameters]
+        if any("Explode" in str(value) for row in rows for value in row):
+            raise RuntimeError("insert failed")
+
+    event.listen(engine.sync_engine, "before_cursor_execute", fail_on_marker)
+    titles = ["One", "Two", "Three", "Explode", "Five"]
+    body = "".join(json.dumps({"title": title}) + "\n" for title in titles).encode()
+
+    report, committed = run_import(engine, body, batch_size=2)
+
+    # Batches are lines 1-2, 3-4 and 5; only the second one fails, as a whole
+    assert report["imported"] == 3
+    assert report["failed"] == 2
+    assert [error["line"] for error in report["errors"]] == [3, 4]
+    assert all(error["error"].startswith("Batch insert failed: ") for error in report["errors"])
+    assert committed == ["Five", "One", "Two"]
+
+
+def test_import_endpoint_rejects_oversized_batch():
+    # No `with`: the endpoint rejects the query before touching the database
+    client = TestClient(app)
+    user_id = str(uuid4())
+    token = create_access_token({"user_id": user_id}, expires_delta=timedelta(minutes=5))
+
+    response = client.post(
+        f"/api/{user_id}/tasks/import?batch_size=5001",
+        content=json.dumps({"title": "Never imported"}).encode(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 422
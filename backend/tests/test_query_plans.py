@@ -0,0 +1,155 @@
+"""
+Every statement TaskService and UserService issue must be served by an index.
+
+Runs against a seeded temporary SQLite database, or against
+QUERY_PLAN_DATABASE_URL (e.g. a local Postgres) when set - that database is
+dropped and re-seeded.
+"""
+
+import asyncio
+import io
+import os
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel, func, select
+
+from query_plan import QueryPlanChecker
+from src.database.seed_data import SeedProgress, seed_database
+from src.models.task import Task
+from src.models.user import User
+from src.schemas.task import TaskCreate, TaskUpdate
+from src.schemas.user import UserCreate
+from src.services.task_service import TaskService
+from src.auth.password_hasher import get_pwd_context
+from src.services.user_service import UserService
+
+SEED_USERS = 20
+SEED_TASKS = 5000
+SEED_PASSWORD = "plan-password"
+
+
+@pytest.fixture(scope="module")
+def plan_db(tmp_path_factory):
+    """Seeded engine plus ids to query: the heaviest user and some of their tasks"""
+    url = os.getenv("QUERY_PLAN_DATABASE_URL") or \
+        f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('query_plans') / 'plans.db'}"
+    # No pooling: each test runs on its own event loop
+    engine = create_async_engine(url, poolclass=NullPool)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+        await seed_database(
+            engine, SEED_USERS, SEED_TASKS, seed=1, hashed_password=get_pwd_context().hash(SEED_PASSWORD),
+            progress=lambda label, total: SeedProgress(label, total, stream=io.StringIO())
+        )
+        async with AsyncSession(engine) as session:
+            user_id, email = (await session.execute(
+                select(Task.user_id, User.email).join(User).group_by(Task.user_id, User.email)
+                .order_by(func.count(Task.id).desc()).limit(1)
+            )).one()
+            task_ids = (await session.execute(
+                select(Task.id).where(Task.user_id == user_id).limit(10)
+            )).scalars().all()
+        return {"user_id": user_id, "email": email, "task_ids": list(task_ids)}
+
+    context = asyncio.run(setup())
+    yield engine, context
+    asyncio.run(engine.dispose())
+
+
+async def _stream_all(service: TaskService, user_id):
+    async for _ in service.stream_user_tasks(user_id, batch_size=500):
+        pass
+
+
+async def _user_without_tasks(session: AsyncSession):
+    user_id = uuid4()
+    session.add(User(id=user_id, email=f"plan-{user_id.hex}@example.com", hashed_password="x"))
+    await session.commit()
+    return user_id
+
+
+async def _update_user(session, ctx):
+    user_id = await _user_without_tasks(session)
+    await UserService(session).update_user(user_id, {"name": "Renamed"})
+
+
+async def _delete_user(session, ctx):
+    user_id = await _user_without_tasks(session)
+    await UserService(session).delete_user(user_id)
+
+
+async def _tasks_json(session, ctx):
+    service = TaskService(session)
+    if not service.supports_json_aggregation():
+        pytest.skip("JSON aggregation not available on this database")
+    await service.get_user_tasks_json(ctx["user_id"])
+
+
+SERVICE_CALLS = {
+    "TaskService.create_task": lambda session, ctx: TaskService(session).create_task(
+        TaskCreate(title="Plan check", user_id=ctx["user_id"]), ctx["user_id"]),
+    "TaskService.get_user_tasks": lambda session, ctx: TaskService(session).get_user_tasks(ctx["user_id"]),
+    "TaskService.get_user_tasks[page]": lambda session, ctx: TaskService(session).get_user_tasks(
+        ctx["user_id"], skip=200, limit=50),
+    "TaskService.get_user_tasks[fields]": lambda session, ctx: TaskService(session).get_user_tasks(
+        ctx["user_id"], fields=("id", "title", "completed")),
+    "TaskService.get_task_by_id": lambda session, ctx: TaskService(session).get_task_by_id(
+        ctx["task_ids"][0], ctx["user_id"]),
+    "TaskService.update_task": lambda session, ctx: TaskService(session).update_task(
+        ctx["task_ids"][1], TaskUpdate(title="Updated"), ctx["user_id"]),
+    "TaskService.toggle_task_completion": lambda session, ctx: TaskService(session).toggle_task_completion(
+        ctx["task_ids"][2], ctx["user_id"]),
+    "TaskService.delete_task": lambda session, ctx: TaskService(session).delete_task(
+        ctx["task_ids"][3], ctx["user_id"]),
+    "TaskService.get_user_task_count": lambda session, ctx: TaskService(session).get_user_task_count(
+        ctx["user_id"]),
+    "TaskService.stream_user_tasks": lambda session, ctx: _stream_all(TaskService(session), ctx["user_id"]),
+    "TaskService.get_user_tasks_json": _tasks_json,
+    "UserService.get_user_by_email": lambda session, ctx: UserService(session).get_user_by_email(ctx["email"]),
+    "UserService.get_user_by_id": lambda session, ctx: UserService(session).get_user_by_id(ctx["user_id"]),
+    "UserService.verify_password": lambda session, ctx: UserService(session).verify_password(
+        ctx["email"], SEED_PASSWORD),
+    "UserService.create_user": lambda session, ctx: UserService(session).create_user(
+        UserCreate(email=f"plan-{uuid4().hex}@example.com", password="pw")),
+    "UserService.update_user": _update_user,
+    "UserService.delete_user": _delete_user,
+}
+
+
+def check_plans(engine, call, ctx):
+    checker = QueryPlanChecker(engine)
+
+    async def run():
+        async with AsyncSession(engine) as session:
+            with checker.capture():
+                await call(session, ctx)
+        return await checker.violations()
+
+    return checker, asyncio.run(run())
+
+
+@pytest.mark.parametrize("name", list(SERVICE_CALLS))
+def test_service_statements_use_indexes(plan_db, name):
+    engine, ctx = plan_db
+    checker, violations = check_plans(engine, SERVICE_CALLS[name], ctx)
+
+    assert checker.statements, f"{name} ran no statements"
+    assert not violations, f"{name}:\n" + "\n".join(violations)
+
+
+def test_checker_flags_unindexed_queries(plan_db):
+    engine, ctx = plan_db
+
+    async def unindexed(session, ctx):
+        await session.execute(select(Task).where(Task.title == "x").order_by(Task.description))
+
+    _, violations = check_plans(engine, unindexed, ctx)
+
+    assert any(v.startswith("full table scan") for v in violations)
+    assert any(v.startswith("sort without an index") for v in violations)
@@ -0,0 +1,51 @@
+"""
+Rate limits of an app built by create_app: the per-address buckets apply
+before authentication, the per-user bucket after it.
+"""
+
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from src.app.main import create_app
+from src.auth.jwt_handler import create_access_token
+from src.config.settings import Settings
+
+
+def limited_client(**limits) -> TestClient:
+    # No `with`: the lifespan warm-up isn't needed for these routes
+    return TestClient(create_app(Settings(admission_control=False, **limits)))
+
+
+def test_invalid_token_flood_is_limited_per_address():
+    client = limited_client(rate_limit_ip="3/minute")
+    headers = {"Authorization": "Bearer not-a-token"}
+
+    statuses = [client.get(f"/api/{uuid4()}/tasks", headers=headers).status_code for _ in range(4)]
+
+    assert statuses == [401, 401, 401, 429]
+
+
+def test_user_budget_and_headers():
+    client = limited_client(rate_limit_user="2/minute")
+    token = create_access_token({"user_id": str(uuid4())})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Another user's tasks: refused after authentication, without touching the database
+    responses = [client.get(f"/api/{uuid4()}/tasks", headers=headers) for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [403, 403, 429]
+    assert responses[0].headers["RateLimit-Limit"] == "2"
+    assert responses[0].headers["RateLimit-Remaining"] == "1"
+    assert responses[0].headers["RateLimit-Policy"] == "1200;w=60, 2;w=60"
+    assert responses[2].headers["Retry-After"] == "30"
+    assert responses[2].json()["error_code"] == "REQ_002"
+
+
+def test_unlimited_paths_have_no_headers():
+    client = limited_client(rate_limit_ip="1/minute")
+
+    for _ in range(3):
+        response = client.get("/livez")
+        assert response.status_code == 200
+        assert "RateLimit-Limit" not in response.headers
@@ -0,0 +1,39 @@
+"""
+A saturated connection pool is reported as such, not as the database down.
+"""
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from src.database.engine import engine
+from src.services import readiness_service
+from src.services.readiness_service import ReadinessProbe
+
+
+def test_probe_does_not_use_the_request_pool():
+    assert ReadinessProbe().db_engine.pool is not engine.pool
+
+
+def test_database_check_passes_while_the_pool_is_full(tmp_path, monkeypatch):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'ready.db'}"
+    # One pooled connection, never more, and requests wait far longer than the probe would
+    app_engine = create_async_engine(url, poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0,
+                                     pool_timeout=30)
+    monkeypatch.setattr(readiness_service, "engine", app_engine)
+    probe = ReadinessProbe(db_timeout=1.0, db_engine=create_async_engine(url, poolclass=NullPool))
+
+    async def run():
+        async with app_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            result = await probe.refresh()
+        await app_engine.dispose()
+        return result
+
+    checks = asyncio.run(run())["checks"]
+
+    assert checks["database"]["ok"] is True
+    assert checks["db_pool"]["checked_out"] == 1
+    assert checks["db_pool"]["saturation"] == 1.0
@@ -0,0 +1,76 @@
+"""
+State the pre-forking server's workers share or keep apart: profiles in a
+shared directory, metrics labelled with the worker's pid, one log file that
+none of them rotates.
+"""
+
+import logging
+
+from src.utils.logging import setup_logging, shutdown_logging, use_external_log_rotation
+from src.utils.metrics import MetricsRegistry
+from src.utils.profiling import ProfileStore
+
+
+def profile(profile_id: str) -> dict:
+    return {"id": profile_id, "path": "/api/x/tasks", "functions": [{"function": "f", "cumtime": 0.1}]}
+
+
+def test_directory_store_is_shared_between_processes(tmp_path):
+    # Two stores on one directory stand in for two workers
+    first, second = ProfileStore(max_profiles=2), ProfileStore(max_profiles=2)
+    first.use_directory(tmp_path)
+    second.use_directory(tmp_path)
+
+    first.add(profile("aaa"))
+    assert second.get("aaa")["functions"] == [{"function": "f", "cumtime": 0.1}]
+    assert [summary["id"] for summary in second.summaries()] == ["aaa"]
+    assert "functions" not in second.summaries()[0]
+
+    second.add(profile("bbb"))
+    second.add(profile("ccc"))
+    # The oldest is evicted for everyone
+    assert first.get("aaa") is None
+    assert {summary["id"] for summary in first.summaries()} == {"bbb", "ccc"}
+
+
+def test_directory_store_ignores_path_ids(tmp_path):
+    store = ProfileStore()
+    store.use_directory(tmp_path / "profiles")
+    (tmp_path / "profiles").mkdir()
+    (tmp_path / "secret.json").write_text('{"id": "secret"}')
+
+    assert store.get("../secret") is None
+
+
+def test_const_labels_are_added_to_every_sample():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests", ("route",)).inc("/a")
+    registry.register_collector(lambda: [("pool_size", "gauge", "Pool size", [({}, 5.0)])])
+    registry.const_labels = {"pid": "123"}
+
+    lines = registry.render().splitlines()
+
+    assert 'requests_total{route="/a",pid="123"} 1' in lines
+    assert 'pool_size{pid="123"} 5' in lines
+
+
+def test_log_file_is_left_to_external_rotation(tmp_path):
+    log_file = tmp_path / "app.log"
+    setup_logging("INFO", log_file=str(log_file), max_bytes=200, backup_count=2)
+    try:
+        use_external_log_rotation()
+        for i in range(20):
+            logging.getLogger("test").info("before rotation %d", i)
+        shutdown_logging()
+        # Far past max_bytes, yet never rotated from in here
+        assert not (tmp_path / "app.log.1").exists()
+        assert log_file.read_text().count("before rotation") == 20
+
+        # logrotate moves the file away; logging carries on in a new one
+        setup_logging("INFO", log_file=str(log_file))
+        use_external_log_rotation()
+        log_file.rename(tmp_path / "app.log.old")
+        logging.getLogger("test").info("after rotation")
+    finally:
+        shutdown_logging()
+    assert "after rotation" in log_file.read_text()
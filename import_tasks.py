@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Script to bulk import tasks for a user from an NDJSON or CSV file
+
+Usage:
+    python import_tasks.py <user_id> <path> [--format ndjson|csv] [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from uuid import UUID
+
+# Add the project root to the path so we can import our models
+sys.path.append(str(Path(__file__).parent / "backend"))
+
+# Import after adding to path
+from src.database.engine import AsyncSessionLocal
+from src.models.user import User  # noqa: F401 - registers the Task.user relationship
+from src.services.import_service import IMPORT_BATCH_SIZE, IMPORT_FORMATS, TaskImporter, iter_file_chunks
+
+
+async def import_tasks(user_id: UUID, path: str, import_format: str, batch_size: int) -> dict:
+    """Import tasks from a file and return the report."""
+    async with AsyncSessionLocal() as session:
+        importer = TaskImporter(session, user_id, import_format, batch_size=batch_size)
+        report = await importer.run(iter_file_chunks(path))
+    return report.to_dict()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import tasks from NDJSON or CSV")
+    parser.add_argument("user_id", type=UUID, help="user the tasks are imported for")
+    parser.add_argument("path", help="NDJSON or CSV file to import")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, dest="import_format",
+                        help="input format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE,
+                        help="rows inserted per transaction")
+    args = parser.parse_args()
+
+    import_format = args.import_format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    report = asyncio.run(import_tasks(args.user_id, args.path, import_format, args.batch_size))
+
+    print(json.dumps(report, indent=2))
+    print(f"Imported {report['imported']} tasks, {report['failed']} failed", file=sys.stderr)
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()